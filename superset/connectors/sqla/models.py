@@ -20,6 +20,7 @@ from __future__ import annotations
 import builtins
 import dataclasses
 import logging
+import re
 from collections import defaultdict
 from collections.abc import Hashable
 from dataclasses import dataclass, field
@@ -118,6 +119,16 @@ metadata = Model.metadata  # pylint: disable=no-member
 logger = logging.getLogger(__name__)
 VIRTUAL_TABLE_ALIAS = "virtual_table"
 
+# DHIS2 virtual datasets: source table and parameter comment in the stored SQL
+_DHIS2_FROM_RE = re.compile(r"FROM\s+(\w+)", re.IGNORECASE)
+_DHIS2_PARAMS_COMMENT_RE = re.compile(r"/\*\s*DHIS2:\s*(.+?)\s*\*/", re.IGNORECASE | re.DOTALL)
+# Result column label matching in assign_column_label
+_LABEL_SEPARATORS_RE = re.compile(r"[.\-\s()]+")
+_LABEL_UNDERSCORES_RE = re.compile(r"_+")
+_LABEL_AGGREGATE_RE = re.compile(
+    r"^(SUM|AVG|COUNT|MIN|MAX|MEDIAN|STDDEV|VAR)\((.+)\)$", re.IGNORECASE
+)
+
 # a non-exhaustive set of additive metrics
 ADDITIVE_METRIC_TYPES = {
     "count",
@@ -1434,7 +1445,6 @@ class SqlaTable(
 
         # Special handling for DHIS2 virtual datasets to preserve SQL comments
         if self.database and self.database.backend == "dhis2" and self.is_virtual and self.sql:
-            import re
             from urllib.parse import unquote
             from flask import g, current_app
             import json
@@ -1443,7 +1453,7 @@ class SqlaTable(
             logger.info(f"[DHIS2] Full SQL stored: {self.sql}")
 
             # Extract DHIS2 table name from SQL (e.g., analytics, not dataset name)
-            from_match = re.search(r'FROM\s+(\w+)', self.sql, re.IGNORECASE)
+            from_match = _DHIS2_FROM_RE.search(self.sql)
             dhis2_table = from_match.group(1) if from_match else self.table_name
 
             # Check extra field first for stored parameters
@@ -1458,20 +1468,20 @@ class SqlaTable(
 
             # Fallback to extracting from SQL comment if not in extra field
             if not dhis2_params:
-                block_match = re.search(r'/\*\s*DHIS2:\s*(.+?)\s*\*/', self.sql, re.IGNORECASE | re.DOTALL)
+                block_match = _DHIS2_PARAMS_COMMENT_RE.search(self.sql)
                 if block_match:
                     dhis2_params = block_match.group(1).strip()
                     dhis2_params = unquote(dhis2_params)
                     logger.info(f"[DHIS2] Extracted parameters from SQL comment: {dhis2_params[:150]}")
 
             if dhis2_params:
-                # Store in application cache with dataset ID as key (persists across requests)
-                cache_key = f"dhis2_params_{self.id}_{dhis2_table}"
+                # Store in application cache with dataset ID as key (persists across requests),
+                # indexed by DHIS2 table for the cursor's fallback lookup
                 try:
-                    from superset.extensions import cache_manager
-                    # Cache for 1 hour (parameters shouldn't change frequently)
-                    cache_manager.data_cache.set(cache_key, dhis2_params, timeout=3600)
-                    logger.info(f"[DHIS2] Cached params with key: {cache_key}")
+                    from superset.db_engine_specs.dhis2_dialect import cache_dataset_params
+
+                    cache_dataset_params(self.id, dhis2_table, dhis2_params)
+                    logger.info(f"[DHIS2] Cached params for dataset {self.id}, table {dhis2_table}")
                 except Exception as e:
                     logger.warning(f"[DHIS2] Could not cache params: {e}")
 
@@ -1683,7 +1693,6 @@ class SqlaTable(
             :param df: Original DataFrame returned by the engine
             :return: Mutated DataFrame
             """
-            import re
             from superset.utils.column_trace_logger import ColumnTraceLogger, log_dataframe_snapshot
             
             labels_expected = query_str_ext.labels_expected
@@ -1698,9 +1707,9 @@ class SqlaTable(
                 if not isinstance(name, str):
                     name = str(name)
                 # Remove parentheses, dots, dashes, and other special characters
-                normalized = re.sub(r'[.\-\s()]+', '_', name)
+                normalized = _LABEL_SEPARATORS_RE.sub('_', name)
                 # Collapse multiple underscores
-                normalized = re.sub(r'_+', '_', normalized)
+                normalized = _LABEL_UNDERSCORES_RE.sub('_', normalized)
                 # Remove leading/trailing underscores
                 normalized = normalized.strip('_')
                 return normalized.lower()
@@ -1717,7 +1726,7 @@ class SqlaTable(
 
                 # Try stripping aggregate function wrapper (SUM(col), AVG(col), etc.)
                 # Pattern: FUNCTION_NAME(column_name)
-                agg_match = re.match(r'^(SUM|AVG|COUNT|MIN|MAX|MEDIAN|STDDEV|VAR)\((.+)\)$', expected, re.IGNORECASE)
+                agg_match = _LABEL_AGGREGATE_RE.match(expected)
                 if agg_match:
                     inner_col = agg_match.group(2)
                     # Try exact match with inner column
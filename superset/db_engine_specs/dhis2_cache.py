@@ -316,6 +316,11 @@ class DHIS2CacheService:
 
     _instance: Optional['DHIS2CacheService'] = None
 
+    # Number of invalidate() calls in this process. In-memory copies of DHIS2
+    # data outside the backend (e.g. the dialect's org unit caches) remember it
+    # and are dropped once it moves on.
+    generation = 0
+
     # Default TTL per endpoint type (in seconds)
     DEFAULT_TTL = {
         'analytics': 3600,          # 1 hour - analytics data is relatively stable
@@ -509,6 +514,8 @@ class DHIS2CacheService:
         Returns:
             Number of cache entries invalidated
         """
+        DHIS2CacheService.generation += 1
+
         if endpoint and params:
             # Specific key
             key = self.generate_cache_key(endpoint, params, base_url)
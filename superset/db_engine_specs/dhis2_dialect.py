@@ -20,29 +20,402 @@ Enables DHIS2 API connections with dynamic parameter support
 """
 from __future__ import annotations
 
+import functools
+import hashlib
+import itertools
 import json
 import logging
+import operator
 import re
-from datetime import datetime
-from typing import Any
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable
+from urllib.parse import quote, unquote, urlencode
+
+import numpy as np
+import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from sqlalchemy.engine import default
 from sqlalchemy import types
+from urllib3.util.retry import Retry
 
-logger = logging.getLogger(__name__)
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(data: Any) -> str:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            return json.dumps(data)
+
+except ImportError:  # pragma: no cover
+    _loads = json.loads
+    _dumps = json.dumps
+
+# Optional helpers, resolved once at import instead of on every query
+try:
+    from flask import current_app
+except ImportError:  # pragma: no cover
+    current_app = None
+
+try:
+    from superset.db_engine_specs.dhis2_cache import DHIS2CacheService, get_dhis2_cache
+except ImportError:  # pragma: no cover
+    DHIS2CacheService = None
+    get_dhis2_cache = None
+
+try:
+    from superset.db_engine_specs.dhis2_loading_strategies import (
+        DHIS2LoadingStrategy,
+        TimeoutConfig,
+    )
+except ImportError:  # pragma: no cover
+    DHIS2LoadingStrategy = None
+    TimeoutConfig = None
 
+logger = logging.getLogger(__name__)
 
+# Patterns used by DHIS2Cursor on every query
+_RE_FROM = re.compile(r'FROM\s+(\w+)', re.IGNORECASE)
+_RE_BLOCK_DHIS2 = re.compile(r'/\*\s*DHIS2:\s*(.+?)\s*\*/', re.IGNORECASE | re.DOTALL)
+_RE_LINE_DHIS2 = re.compile(r'--\s*DHIS2:\s*(.+?)(?:\n|$)', re.IGNORECASE)
+_RE_WHERE = re.compile(r'WHERE\s+(.+?)(?:ORDER BY|GROUP BY|LIMIT|$)', re.IGNORECASE | re.DOTALL)
+_RE_EQ_COND = re.compile(r'(\w+)\s*=\s*[\'"]([^\'"]+)[\'"]')
+# Split a combined dimension string before each dx:/pe:/ou: prefix
+_RE_DIM_SPLIT = re.compile(r';(?=(?:dx|pe|ou):)')
+_RE_SELECT = re.compile(r'SELECT\s+(.+?)\s+FROM', re.IGNORECASE | re.DOTALL)
+_RE_DHIS2_TABLE = re.compile(r'/\*\s*DHIS2:.*table=([^&\s]+)', re.IGNORECASE)
+# Runs of non-word characters and underscores collapse to one underscore
+_RE_COLUMN_SEPARATORS = re.compile(r'[\W_]+')
+
+
+@functools.lru_cache(maxsize=4096)
 def sanitize_dhis2_column_name(name: str) -> str:
     """
     Sanitize DHIS2 column names for Superset compatibility.
     Replaces all special characters with underscores to prevent layout distortions.
     Must match the sanitization in _normalize_analytics_pivoted to ensure
     column names in metadata match column names in returned DataFrames.
+
+    The same few hundred data element and level names are sanitized on every
+    query, column listing and chart render, so results are memoized.
+    """
+    return _RE_COLUMN_SEPARATORS.sub('_', name).strip('_')
+
+
+@functools.lru_cache(maxsize=512)
+def _table_from_query(query: str) -> str | None:
+    """
+    Interned table name from the query's FROM clause, or None.
+
+    Auto-refreshing charts re-execute identical SQL, so the scan is memoized;
+    maxsize bounds how many query strings are retained.
+    """
+    from_match = _RE_FROM.search(query)
+    return sys.intern(from_match.group(1)) if from_match else None
+
+
+@functools.lru_cache(maxsize=64)
+def _column_translation_pattern(originals: frozenset[str]) -> re.Pattern:
+    """Match any of ``originals`` wrapped in matching single or double quotes"""
+    alternation = "|".join(map(re.escape, sorted(originals, key=len, reverse=True)))
+    return re.compile(rf"([\"'])({alternation})\1")
+
+
+# Dimension and measure column names: the cursor forces them to strings or
+# floats, and default endpoint columns are typed from them
+_DIM_COLS = frozenset({"Period", "OrgUnit", "DataElement", "period", "orgUnit", "dataElement"})
+_MEASURE_COLS = frozenset({"Value", "value"})
+
+
+# DHIS2 geoFeatures "ty" codes by organisationUnit featureType
+_FEATURE_TYPE_CODES = {
+    "POINT": 1,
+    "POLYGON": 2,
+    "MULTI_POLYGON": 3,
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _date_range_for_bucket(bucket: int) -> tuple[str, str]:
+    """(startDate, endDate) strings for the last year; cached per minute bucket"""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=365)
+    return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+
+
+def _default_date_range() -> tuple[str, str]:
+    """Default one-year window used when a query carries no period"""
+    return _date_range_for_bucket(int(time.time() // 60))
+
+
+# DHIS2 dimension column patterns
+# ((pattern_key, dimension_prefix), column name patterns) in match priority order
+_DIMENSION_PATTERNS: tuple[tuple[tuple[str, str], tuple[str, ...]], ...] = (
+    # Organisation/Location dimensions
+    (('orgunit', 'ou'), ('orgunit', 'organisation_unit', 'ou', 'organisationunit')),
+
+    # Time dimensions
+    (('period', 'pe'), ('period', 'pe', 'time', 'date', 'year', 'month', 'quarter')),
+
+    # Data element dimensions
+    (('dataelement', 'dx'), ('dataelement', 'data_element', 'dx', 'element', 'indicator')),
+
+    # Category/Category Option dimensions
+    (('category', 'ca'), ('category', 'ca')),
+    (('categoryoption', 'co'), ('categoryoption', 'category_option', 'co')),
+
+    # Program Stage
+    (('programstage', 'ps'), ('programstage', 'program_stage', 'ps')),
+
+    # Tracked Entity
+    (('trackedentity', 'te'), ('trackedentity', 'tracked_entity', 'te')),
+
+    # Organisation Unit Group
+    (('organisationunitgroup', 'oug'), ('organisationunitgroup', 'organisation_unit_group', 'oug')),
+)
+
+# Prefixes that start a new dimension inside a combined "dx:..;pe:..;ou:.." string
+_DIMENSION_TYPES = frozenset(
+    {"dx", "pe", "ou"} | {dimension_prefix for (_, dimension_prefix), _ in _DIMENSION_PATTERNS}
+)
+
+# Known metric/value column names that should NOT be dimensions
+_METRIC_PATTERNS = (
+    'value', 'values', 'count', 'sum', 'avg', 'average', 'min', 'maximum', 'max',
+    'stddev', 'variance', 'total', 'data', 'result',
+    # Aggregation functions
+    'ccount', 'countnnon', 'sum_sq',
+)
+
+# (sanitized pattern, dimension prefix) in match priority order, so the
+# per-column scan no longer re-sanitizes every pattern. Prefixes are interned
+# so the dimension strings built from them share one object per prefix.
+_SANITIZED_DIMENSION_PATTERNS = tuple(
+    (sanitize_dhis2_column_name(pattern.lower()), sys.intern(dimension_prefix))
+    for (_, dimension_prefix), patterns in _DIMENSION_PATTERNS
+    for pattern in patterns
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _dimension_prefix_for_column(col: str) -> str | None:
+    """
+    DHIS2 dimension prefix for a selected column name, or None for metric and
+    unrecognised columns. The first matching pattern wins.
+    """
+    col_lower = col.lower()
+    if any(metric_pat in col_lower for metric_pat in _METRIC_PATTERNS):
+        return None
+
+    col_sanitized = sanitize_dhis2_column_name(col_lower)
+    for pattern_sanitized, dimension_prefix in _SANITIZED_DIMENSION_PATTERNS:
+        if pattern_sanitized in col_sanitized:
+            return dimension_prefix
+    return None
+
+
+# "LEVEL-n" ou dimension tokens for common hierarchy depths; _LEVEL_TOKENS[n - 1] is LEVEL-n
+_LEVEL_TOKENS = tuple(f"LEVEL-{level}" for level in range(1, 16))
+
+
+def _level_tokens(first: int, last: int) -> list[str]:
+    """LEVEL-first .. LEVEL-last inclusive"""
+    if last <= len(_LEVEL_TOKENS):
+        return list(_LEVEL_TOKENS[first - 1:last])
+    return [f"LEVEL-{level}" for level in range(first, last + 1)]
+
+
+def _lowest_level_only(min_selected_level: int, max_level: int) -> list[str]:
+    """lowest_level scope: only the deepest level (leaf nodes)"""
+    return _level_tokens(max_level, max_level)
+
+
+def _children_level(min_selected_level: int, max_level: int) -> list[str]:
+    """children scope: one level below the selected org units"""
+    next_level = min_selected_level + 1
+    return _level_tokens(next_level, next_level) if next_level <= max_level else []
+
+
+def _all_levels_below(min_selected_level: int, max_level: int) -> list[str]:
+    """all_levels scope: every level below the selected org units"""
+    return _level_tokens(min_selected_level + 1, max_level)
+
+
+# dataLevelScope -> LEVEL-n tokens to add to the ou dimension
+_LEVEL_SCOPE_HANDLERS = {
+    "lowest_level": _lowest_level_only,
+    "children": _children_level,
+    "all_levels": _all_levels_below,
+}
+# Scopes that switch the ou dimension to LEVEL syntax even without DESCENDANTS
+_LEVEL_SCOPES = frozenset(_LEVEL_SCOPE_HANDLERS)
+
+
+# organisationUnitLevels per DHIS2 base URL: {base_url: (fetched_at, {level: name})}.
+# Levels change very rarely, so they are shared by every connection in the process.
+_ORG_UNIT_LEVELS_CACHE: dict[str, tuple[float, dict[int, str]]] = {}
+_ORG_UNIT_LEVELS_TTL = 3600
+# Empty or failed lookups are remembered briefly so an instance without levels
+# does not cost a round-trip on every query
+_ORG_UNIT_LEVELS_EMPTY_TTL = 60
+
+
+# Seconds saved dataset params stay in the data cache, per dataset
+# (dhis2_params_{id}_{table}) and in the per-table index (see cache_dataset_params)
+_PARAMS_CACHE_TIMEOUT = 3600
+
+# Tables whose dhis2_params_by_table cache lookup recently came back empty:
+# {table_name: monotonic time of the miss}. Lets repeated queries skip the cache
+# backend round-trip for a few seconds; cache_dataset_params clears a table's
+# entry. Shared by all cursor threads, so only touched under the lock.
+_PARAMS_CACHE_MISSES: OrderedDict[str, float] = OrderedDict()
+_PARAMS_CACHE_MISSES_LOCK = threading.Lock()
+_PARAMS_CACHE_MISS_TTL = 5
+_PARAMS_CACHE_MISS_SIZE = 1024
+
+
+def _params_cache_recently_missed(table_name: str) -> bool:
+    """Whether the params lookup for table_name came back empty moments ago"""
+    with _PARAMS_CACHE_MISSES_LOCK:
+        missed_at = _PARAMS_CACHE_MISSES.get(table_name)
+    return missed_at is not None and time.monotonic() - missed_at < _PARAMS_CACHE_MISS_TTL
+
+
+def _set_params_cache_miss(table_name: str, missed: bool) -> None:
+    """Record (or clear) an empty params lookup for table_name"""
+    with _PARAMS_CACHE_MISSES_LOCK:
+        if not missed:
+            _PARAMS_CACHE_MISSES.pop(table_name, None)
+            return
+        _PARAMS_CACHE_MISSES[table_name] = time.monotonic()
+        _PARAMS_CACHE_MISSES.move_to_end(table_name)
+        while len(_PARAMS_CACHE_MISSES) > _PARAMS_CACHE_MISS_SIZE:
+            _PARAMS_CACHE_MISSES.popitem(last=False)
+
+
+def cache_dataset_params(dataset_id: int, table_name: str, params: str) -> None:
+    """
+    Cache the DHIS2 params of a saved dataset reading table_name.
+
+    Besides the per-dataset key, the params go into a per-table index,
+    {dataset_id: (written_at, params)}, so _cached_dataset_params finds them
+    with a single lookup however many datasets share the table.
     """
-    name = re.sub(r'[^\w]', '_', name)
-    name = re.sub(r'_+', '_', name)
-    name = name.strip('_')
-    return name
+    from superset.extensions import cache_manager
+
+    cache = cache_manager.data_cache
+    index_key = f"dhis2_params_by_table:{table_name}"
+    now = time.time()
+    index = cache.get(index_key)
+    # Drop entries whose own per-dataset key would have expired by now
+    index = {
+        other_id: entry
+        for other_id, entry in (index.items() if isinstance(index, dict) else ())
+        if now - entry[0] < _PARAMS_CACHE_TIMEOUT
+    }
+    index[dataset_id] = (now, params)
+    cache.set_many(
+        {f"dhis2_params_{dataset_id}_{table_name}": params, index_key: index},
+        timeout=_PARAMS_CACHE_TIMEOUT,
+    )
+    # Queries in this process see the new params right away
+    _set_params_cache_miss(table_name, False)
+
+
+def _cached_dataset_params(table_name: str) -> str | None:
+    """
+    Params cached by cache_dataset_params for table_name. When several
+    datasets read the table, the lowest dataset id wins, as it did when the
+    per-dataset keys were probed in id order.
+    """
+    from superset.extensions import cache_manager
+
+    index = cache_manager.data_cache.get(f"dhis2_params_by_table:{table_name}")
+    if not isinstance(index, dict):
+        return None
+    now = time.time()
+    for dataset_id in sorted(index):
+        written_at, params = index[dataset_id]
+        if params and now - written_at < _PARAMS_CACHE_TIMEOUT:
+            return params
+    return None
+
+
+# Hierarchy columns built for each org unit; _HIERARCHY_LEVEL_KEYS[n - 1] is level_n
+_HIERARCHY_LEVEL_KEYS = tuple(f"level_{level}" for level in range(1, 7))
+
+# organisationUnits batch requests currently in flight:
+# {(DHIS2Connection.cache_scope, url): Future}. Cursors of the same user on
+# other threads asking for the same batch wait on it instead of re-requesting.
+_OU_BATCH_INFLIGHT: dict[tuple[tuple[str, str], str], Future] = {}
+_OU_BATCH_INFLIGHT_LOCK = threading.Lock()
+
+# organisationUnits entries (id, displayName, path) per DHIS2 server and user
+# (DHIS2Connection.cache_scope), since users see different parts of the
+# hierarchy: {scope: OrderedDict{ou_id: (fetched_at, org_unit)}}. Org units
+# rarely move, so hierarchy lookups across queries and dashboards share them.
+# Each scope keeps its _OU_CACHE_SIZE most recently used entries.
+_OU_CACHE: dict[tuple[str, str], OrderedDict[str, tuple[float, dict]]] = {}
+_OU_CACHE_LOCK = threading.Lock()
+_OU_CACHE_TTL = 3600
+_OU_CACHE_SIZE = 200_000
+# _cache_generation() the entries in _OU_CACHE were fetched under
+_OU_CACHE_GENERATION = 0
+
+# Seconds a connection reuses an org unit hierarchy it built (see
+# DHIS2Cursor._fetch_org_unit_hierarchy). Short, like the other in-memory
+# metadata caches, so moved or renamed org units show up on the next refresh.
+_OU_HIERARCHY_TTL = 60
+
+
+def _cache_generation() -> int:
+    """DHIS2CacheService invalidation count; see DHIS2CacheService.generation"""
+    return DHIS2CacheService.generation if DHIS2CacheService is not None else 0
+
+
+def _scope_ou_cache(scope: tuple[str, str]) -> OrderedDict[str, tuple[float, dict]]:
+    """
+    _OU_CACHE entries of scope. Everything cached before the last
+    DHIS2CacheService invalidation is dropped first. Call with _OU_CACHE_LOCK held.
+    """
+    global _OU_CACHE_GENERATION
+    generation = _cache_generation()
+    if generation != _OU_CACHE_GENERATION:
+        _OU_CACHE.clear()
+        _OU_CACHE_GENERATION = generation
+    return _OU_CACHE.setdefault(scope, OrderedDict())
+
+
+def _chunked(items: list[str], size: int) -> list[list[str]]:
+    """Split items into consecutive lists of at most `size` elements"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _packed(items: list[str], budget: int) -> list[list[str]]:
+    """
+    Split items into consecutive lists whose comma-joined length stays within
+    `budget` characters. An item longer than the budget gets a list of its own.
+    """
+    batches: list[list[str]] = []
+    batch: list[str] = []
+    used = -1  # the first item in a batch has no leading comma
+    for item in items:
+        if batch and used + 1 + len(item) > budget:
+            batches.append(batch)
+            batch, used = [], -1
+        batch.append(item)
+        used += 1 + len(item)
+    if batch:
+        batches.append(batch)
+    return batches
 
 
 class DHIS2MappingDSL:
@@ -267,7 +640,7 @@ class DHIS2EndpointDiscovery:
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = _loads(response.content)
                 resources = data.get("resources", [])
 
                 # Extract endpoint names from resources
@@ -332,6 +705,88 @@ class DHIS2EndpointDiscovery:
         ]
 
 
+def _parse_org_unit_levels(data: dict) -> dict[int, str]:
+    """Map level number to display name from an organisationUnitLevels payload"""
+    levels_map = {}
+    for level in data.get('organisationUnitLevels', []):
+        level_num = level.get('level')
+        level_name = level.get('displayName', f'Level_{level_num}')
+        if level_num:
+            levels_map[level_num] = level_name
+    return levels_map
+
+
+def _analytics_number(value: Any) -> Any:
+    """Return an analytics value as int/float when it parses as a number"""
+    if value is None:
+        return None
+    try:
+        value = float(value)
+        if value.is_integer():
+            value = int(value)
+    except (ValueError, AttributeError):
+        pass  # Keep as string
+    return value
+
+
+def _analytics_numbers(values: list) -> list:
+    """
+    _analytics_number over a whole column. All-numeric columns are parsed by
+    NumPy in one pass (with float() semantics); otherwise pd.to_numeric picks
+    out the numbers. Anything left unparsed goes through the scalar conversion,
+    which also keeps None and non-numeric strings as they are.
+    """
+    try:
+        numbers = np.array(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        numbers = (
+            pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+            .astype("float64")
+            .to_numpy()
+        )
+    is_number = ~np.isnan(numbers)
+    is_int = is_number & np.isfinite(numbers) & (np.floor(numbers) == numbers)
+    fits_int64 = is_int & (np.abs(numbers) < 2**63)
+
+    result = numbers.astype(object)
+    result[fits_int64] = numbers[fits_int64].astype(np.int64)
+    for idx in np.flatnonzero(is_int & ~fits_int64):
+        result[idx] = int(numbers[idx])
+    for idx in np.flatnonzero(~is_number):
+        result[idx] = _analytics_number(values[idx])
+    return result.tolist()
+
+
+def _intern(value: Any) -> Any:
+    """sys.intern for strings, anything else unchanged"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _map_column(values: list, lookup: Callable[[Any], Any]) -> list:
+    """Apply lookup once per distinct value and spread the results over values"""
+    series = pd.Series(values, dtype=object)
+    uniques = series.unique()
+    return series.map(dict(zip(uniques, map(lookup, uniques)))).tolist()
+
+
+
+def _dict_rows(items: list, keys: list) -> list[tuple]:
+    """Project dict items onto keys as tuples, None for missing keys"""
+    if not keys:
+        return [() for _ in items]
+    getter = operator.itemgetter(*keys)
+    try:
+        if len(keys) == 1:
+            return [(value,) for value in map(getter, items)]
+        return list(map(getter, items))
+    except (KeyError, TypeError):
+        # Ragged items or non-dict entries: fall back to per-key lookups
+        return [
+            tuple(item.get(key) for key in keys) if isinstance(item, dict) else (item,)
+            for item in items
+        ]
+
+
 class DHIS2ResponseNormalizer:
     """
     Endpoint-aware response normalizer
@@ -354,18 +809,16 @@ class DHIS2ResponseNormalizer:
             Source table name (e.g., "analytics") or None
         """
         # First try to extract from SQL comment
-        table_match = re.search(r'/\*\s*DHIS2:.*table=([^&\s]+)', sql, re.IGNORECASE)
+        table_match = _RE_DHIS2_TABLE.search(sql)
         if table_match:
             return table_match.group(1).strip()
 
         # Fallback: Parse from table name in FROM clause
-        from_match = re.search(r'FROM\s+(\w+)', sql, re.IGNORECASE)
+        from_match = _RE_FROM.search(sql)
         if from_match:
             table_name = from_match.group(1)
             # If it contains underscore, take first part (e.g., analytics_version2 -> analytics)
-            if '_' in table_name:
-                return table_name.split('_')[0]
-            return table_name
+            return table_name.partition('_')[0]
 
         return None
 
@@ -380,36 +833,26 @@ class DHIS2ResponseNormalizer:
         Each row represents one data point.
         """
         # Find column indices
-        col_map = {}
-        for idx, h in enumerate(headers):
-            col_map[h.get("name", h.get("column"))] = idx
-
-        dx_idx = col_map.get("dx")
-        pe_idx = col_map.get("pe")
-        ou_idx = col_map.get("ou")
-        value_idx = col_map.get("value")
+        col_map = {h.get("name", h.get("column")): idx for idx, h in enumerate(headers)}
+        dx_idx, pe_idx, ou_idx, value_idx = map(col_map.get, ("dx", "pe", "ou", "value"))
 
         # Column names for long format - ALL columns MUST be SANITIZED
         col_names = [sanitize_dhis2_column_name(col) for col in ["Period", "OrgUnit", "DataElement", "Value"]]
 
-        # Build rows in long format
-        long_rows = []
-        for row in rows_data:
-            pe_name = get_name_func(row[pe_idx]) if pe_idx is not None else None
-            ou_name = get_name_func(row[ou_idx]) if ou_idx is not None else None
-            dx_name = get_name_func(row[dx_idx]) if dx_idx is not None else None
-            value = row[value_idx] if value_idx is not None else None
+        # Build the long format column by column; names are looked up once
+        # per distinct UID
+        missing = [None] * len(rows_data)
 
-            # Convert value to appropriate type
-            if value is not None:
-                try:
-                    value = float(value)
-                    if value.is_integer():
-                        value = int(value)
-                except (ValueError, AttributeError):
-                    pass  # Keep as string
+        def name_column(idx: int | None) -> list:
+            if idx is None:
+                return missing
+            return _map_column(list(map(operator.itemgetter(idx), rows_data)), get_name_func)
+
+        values = missing
+        if value_idx is not None:
+            values = _analytics_numbers(list(map(operator.itemgetter(value_idx), rows_data)))
 
-            long_rows.append((pe_name, ou_name, dx_name, value))
+        long_rows = list(zip(name_column(pe_idx), name_column(ou_idx), name_column(dx_idx), values))
 
         logger.info(f"Returned LONG format: {len(long_rows)} rows (Period, OrgUnit, DataElement, Value)")
         return col_names, long_rows
@@ -442,21 +885,25 @@ class DHIS2ResponseNormalizer:
         if not rows_data:
             return ["Period", "OrgUnit"], []
 
-        # Map UIDs to readable names from metadata
+        # Map UIDs to readable names from metadata, resolved once up front.
+        # Names are interned: every row cell referring to a UID reuses the one
+        # name object (see _map_column and the pivot index), and interning
+        # extends that sharing across responses for the same server.
         items = metadata.get("items", {})
+        name_map = {
+            uid: _intern(item.get("name", uid) if isinstance(item, dict) else uid)
+            for uid, item in items.items()
+        }
 
         def get_name(uid: str) -> str:
             """Get human-readable name for UID"""
-            item = items.get(uid, {})
-            return item.get("name", uid)
+            return name_map[uid] if uid in name_map else _intern(uid)
 
         # If not pivoting, return long format immediately
         if not pivot:
-            print(f"[DHIS2] normalize_analytics: pivot={pivot}, using LONG format")
             logger.info(f"normalize_analytics called with pivot={pivot}, returning LONG format")
             return DHIS2ResponseNormalizer._normalize_analytics_long_format(headers, rows_data, get_name)
 
-        print(f"[DHIS2] normalize_analytics: pivot={pivot}, using WIDE/PIVOTED format")
         logger.info(f"normalize_analytics called with pivot={pivot}, returning WIDE format")
 
         # Ensure columns for analytics/dataValueSets endpoints are always wide format
@@ -465,14 +912,8 @@ class DHIS2ResponseNormalizer:
         # Fix undefined values by mapping backend columns to frontend fields
 
         # Find column indices - handle missing dimensions
-        col_map = {}
-        for idx, h in enumerate(headers):
-            col_map[h.get("name", h.get("column"))] = idx
-
-        dx_idx = col_map.get("dx")
-        pe_idx = col_map.get("pe")
-        ou_idx = col_map.get("ou")
-        value_idx = col_map.get("value")
+        col_map = {h.get("name", h.get("column")): idx for idx, h in enumerate(headers)}
+        dx_idx, pe_idx, ou_idx, value_idx = map(col_map.get, ("dx", "pe", "ou", "value"))
 
         # Check if we have all required dimensions for pivoting
         has_full_dimensions = dx_idx is not None and pe_idx is not None and ou_idx is not None
@@ -491,55 +932,42 @@ class DHIS2ResponseNormalizer:
                     col_names.append(sanitize_dhis2_column_name(name))
 
             # Convert rows, mapping dx UIDs to names
-            converted_rows = []
-            for row in rows_data:
-                converted_row = []
-                for idx, val in enumerate(row):
-                    if idx == dx_idx and val:
-                        converted_row.append(get_name(val))
-                    else:
-                        converted_row.append(val)
-                converted_rows.append(tuple(converted_row))
+            if dx_idx is None:
+                converted_rows = list(map(tuple, rows_data))
+            else:
+                converted_rows = []
+                for row in rows_data:
+                    if len(row) > dx_idx and row[dx_idx]:
+                        row = list(row)
+                        row[dx_idx] = get_name(row[dx_idx])
+                    converted_rows.append(tuple(row))
 
             return col_names, converted_rows
 
         # Full pivot logic - we have dx, pe, ou, value
-        # Collect all unique data elements, periods, org units
-        data_elements = set()
-        periods = set()
-        org_units = set()
-
-        for row in rows_data:
-            if len(row) > max(dx_idx, pe_idx, ou_idx):
-                data_elements.add(row[dx_idx])
-                periods.add(row[pe_idx])
-                org_units.add(row[ou_idx])
-
-        # Build pivot structure: {(period, orgUnit): {dataElement: value}}
-        pivot_data = {}
-        for row in rows_data:
-            if len(row) > max(dx_idx, pe_idx, ou_idx, value_idx):
-                dx = row[dx_idx]
-                pe = row[pe_idx]
-                ou = row[ou_idx]
-                val = row[value_idx]
-
-                # Convert string values to numbers for numeric data
-                if val is not None and val != '':
-                    try:
-                        # Try float first (handles both int and float)
-                        val = float(val)
-                        # Convert to int if it's a whole number
-                        if val.is_integer():
-                            val = int(val)
-                    except (ValueError, AttributeError):
-                        # Keep as string if conversion fails
-                        pass
-
-                key = (pe, ou)
-                if key not in pivot_data:
-                    pivot_data[key] = {}
-                pivot_data[key][dx] = val
+        # Pivot {(period, orgUnit): {dataElement: value}} in pandas; for
+        # repeated cells the last row wins, and rows come out sorted by
+        # (period, orgUnit) with data elements as sorted columns. Pandas only
+        # pivots row positions: cells are then filled from the converted
+        # values, so a missing cell is None while a "nan" value stays NaN.
+        dim_width = max(dx_idx, pe_idx, ou_idx)
+        row_width = max(dim_width, -1 if value_idx is None else value_idx)
+        value_rows = [row for row in rows_data if len(row) > row_width]
+        frame = pd.DataFrame(
+            {
+                "pe": pd.Series(list(map(operator.itemgetter(pe_idx), value_rows)), dtype=object),
+                "ou": pd.Series(list(map(operator.itemgetter(ou_idx), value_rows)), dtype=object),
+                "dx": pd.Series(list(map(operator.itemgetter(dx_idx), value_rows)), dtype=object),
+                "pos": np.arange(len(value_rows)),
+            }
+        )
+        # Convert string values to numbers for numeric data; the trailing
+        # entry is what missing cells (position -1) pick up
+        cell_values = np.empty(len(value_rows) + 1, dtype=object)
+        if value_idx is not None:
+            cell_values[:-1] = _analytics_numbers(
+                list(map(operator.itemgetter(value_idx), value_rows))
+            )
 
         # Build column names: Period, Level_1_Name, Level_2_Name, ..., DataElement_1, DataElement_2, ...
         # IMPORTANT: ALL columns MUST be SANITIZED to match column metadata from get_columns()!
@@ -548,7 +976,10 @@ class DHIS2ResponseNormalizer:
         # 2. Chart formData (user selections) - references sanitized names
         # 3. Query results (this function) - must return sanitized names
         # Note: OrgUnit column removed - hierarchy levels provide the granular context
-        data_element_list = sorted(data_elements)
+        # Rows without a value still contribute their data element column
+        data_element_list = sorted(
+            {row[dx_idx] for row in rows_data if len(row) > dim_width}
+        )
         col_names = [sanitize_dhis2_column_name("Period")]
         
         if org_unit_level_names is None:
@@ -567,60 +998,49 @@ class DHIS2ResponseNormalizer:
         
         col_names.extend([sanitize_dhis2_column_name(get_name(de)) for de in data_element_list])
 
-        print(f"[DHIS2] PIVOT CONSTRUCTION:")
-        print(f"[DHIS2]   data_elements (UIDs): {sorted(data_elements)}")
-        print(f"[DHIS2]   data_element_list (sorted UIDs): {data_element_list}")
-        print(f"[DHIS2]   col_names (SANITIZED): {col_names}")
-        logger.info(f"[DHIS2] Column construction - data_elements: {sorted(data_elements)}")
         logger.info(f"[DHIS2] Column names constructed (SANITIZED): {col_names}")
 
         # Build rows
-        pivoted_rows = []
-        for (pe, ou) in sorted(pivot_data.keys()):
-            pe_name = get_name(pe)
+        if org_unit_level_names:
+            levels_to_append = sorted(org_unit_level_names.keys())
+        else:
+            levels_to_append = list(range(1, 7))
+        level_keys = [f"level_{level}" for level in levels_to_append]
+        no_levels = (None,) * len(level_keys)
 
-            # Debug logging to identify concatenation
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug(f"Pivoting row - PE UID: {pe}, PE name: {pe_name}, OU UID: {ou}")
+        # Hierarchy values for available levels only
+        def hierarchy_levels(ou: str) -> tuple:
+            if not (org_unit_hierarchy and ou):
+                return no_levels
+            try:
+                hierarchy_info = org_unit_hierarchy.get(ou, {})
+                return tuple(hierarchy_info.get(key) for key in level_keys)
+            except Exception as e:
+                logger.warning("Error appending hierarchy for %s: %s", ou, e)
+                return no_levels
 
-            row = [pe_name]
-            
-            # Append hierarchy values for available levels only
-            if org_unit_level_names:
-                levels_to_append = sorted(org_unit_level_names.keys())
-            else:
-                levels_to_append = list(range(1, 7))
-            
-            if org_unit_hierarchy and ou:
-                try:
-                    hierarchy_info = org_unit_hierarchy.get(ou, {})
-                    # Debug: Log hierarchy info for first few rows
-                    if len(pivoted_rows) < 3:
-                        print(f"[DHIS2] Row {len(pivoted_rows)}: OU={ou}, hierarchy_info={hierarchy_info}")
-                    for level in levels_to_append:
-                        level_name = hierarchy_info.get(f"level_{level}", None)
-                        row.append(level_name)
-                except Exception as e:
-                    logger.warning(f"Error appending hierarchy for {ou}: {e}")
-                    row.extend([None] * len(levels_to_append))
-            else:
-                if len(pivoted_rows) < 3:
-                    print(f"[DHIS2] Row {len(pivoted_rows)}: OU={ou}, NO HIERARCHY (org_unit_hierarchy={bool(org_unit_hierarchy)})")
-                row.extend([None] * len(levels_to_append))
-            
-            for de in data_element_list:
-                value = pivot_data[(pe, ou)].get(de, None)
-                row.append(value)
-            
-            pivoted_rows.append(tuple(row))
-            
-            if len(pivoted_rows) == 1:
-                logger.info(f"[DHIS2] FIRST ROW CONSTRUCTION:")
-                logger.info(f"[DHIS2]   Period (index 0): {row[0]}")
-                data_element_start_idx = 1 + len(levels_to_append)
-                for i, de in enumerate(data_element_list):
-                    de_idx = data_element_start_idx + i
-                    logger.info(f"[DHIS2]   {get_name(de)} (index {de_idx}): {row[de_idx]}")
+        pivoted_rows = []
+        if not frame.empty:
+            wide = (
+                frame.drop_duplicates(["pe", "ou", "dx"], keep="last")
+                .pivot(index=["pe", "ou"], columns="dx", values="pos")
+                .reindex(columns=data_element_list)
+            )
+            cells = cell_values[wide.fillna(-1).to_numpy(dtype=np.int64)]
+            # Period names and hierarchy levels are resolved once per distinct
+            # value and picked per row by index code; code -1 (a missing
+            # dimension value) selects the trailing None entry
+            pe_level, ou_level = wide.index.levels
+            pe_codes, ou_codes = (codes.tolist() for codes in wide.index.codes)
+            period_names = [get_name(pe) for pe in pe_level] + [None]
+            ou_levels = [hierarchy_levels(ou) for ou in ou_level] + [no_levels]
+            pivoted_rows = [
+                (period_names[pe], *ou_levels[ou], *values)
+                for pe, ou, values in zip(pe_codes, ou_codes, cells.tolist())
+            ]
+
+        if pivoted_rows and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DHIS2] First pivoted row: %s", pivoted_rows[0])
 
         # Log first few rows for debugging
         if pivoted_rows and logger.isEnabledFor(logging.INFO):
@@ -676,12 +1096,9 @@ class DHIS2ResponseNormalizer:
         else:
             levels_to_append = list(range(1, 7))
         
-        for dv in data_values:
-            row = [
-                dv.get("dataElement"),
-                dv.get("period"),
-                dv.get("value"),
-            ]
+        base_rows = _dict_rows(data_values, ["dataElement", "period", "value"])
+        for dv, base in zip(data_values, base_rows):
+            row = list(base)
             
             if org_unit_hierarchy and dv.get("orgUnit"):
                 try:
@@ -752,7 +1169,20 @@ class DHIS2ResponseNormalizer:
                 data_element_ids.add(dv.get("dataElement"))
 
         # Add data element columns
-        col_names.extend([sanitize_dhis2_column_name(de_id) for de_id in sorted(data_element_ids)])
+        data_element_ids_sorted = sorted(data_element_ids)
+        col_names.extend([sanitize_dhis2_column_name(de_id) for de_id in data_element_ids_sorted])
+
+        if org_unit_level_names:
+            levels_to_append = sorted(org_unit_level_names.keys())
+        else:
+            levels_to_append = list(range(1, 7))
+        level_keys = [f"level_{level}" for level in levels_to_append]
+
+        # Data values land at a fixed offset after the base, hierarchy and
+        # date columns, so each event only touches the values it carries
+        de_offset = len(base_cols) + len(level_keys) + 5
+        de_index = {de_id: de_offset + i for i, de_id in enumerate(data_element_ids_sorted)}
+        no_values = [None] * len(data_element_ids_sorted)
 
         rows = []
         for event in events:
@@ -767,19 +1197,11 @@ class DHIS2ResponseNormalizer:
             ]
 
             # Add hierarchy values
-            if org_unit_level_names:
-                levels_to_append = sorted(org_unit_level_names.keys())
-            else:
-                levels_to_append = list(range(1, 7))
-
             if org_unit_hierarchy and ou_id:
                 hierarchy_info = org_unit_hierarchy.get(ou_id, {})
-                for level in levels_to_append:
-                    level_value = hierarchy_info.get(f"level_{level}", None)
-                    row.append(level_value)
+                row.extend([hierarchy_info.get(key) for key in level_keys])
             else:
-                for _ in levels_to_append:
-                    row.append(None)
+                row.extend([None] * len(level_keys))
 
             # Add date and status values
             row.extend([
@@ -790,15 +1212,10 @@ class DHIS2ResponseNormalizer:
                 event.get("lastUpdated"),
             ])
 
-            # Build dict of dataElement -> value
-            dv_dict = {
-                dv.get("dataElement"): dv.get("value")
-                for dv in event.get("dataValues", [])
-            }
-
-            # Append values for each dataElement column
-            for de_id in sorted(data_element_ids):
-                row.append(dv_dict.get(de_id))
+            # Fill the dataElement columns this event has values for
+            row.extend(no_values)
+            for dv in event.get("dataValues", []):
+                row[de_index[dv.get("dataElement")]] = dv.get("value")
 
             rows.append(tuple(row))
 
@@ -855,7 +1272,20 @@ class DHIS2ResponseNormalizer:
                 attribute_ids.add(attr.get("attribute"))
 
         # Add attribute columns
-        col_names.extend([sanitize_dhis2_column_name(attr_id) for attr_id in sorted(attribute_ids)])
+        attribute_ids_sorted = sorted(attribute_ids)
+        col_names.extend([sanitize_dhis2_column_name(attr_id) for attr_id in attribute_ids_sorted])
+
+        if org_unit_level_names:
+            levels_to_append = sorted(org_unit_level_names.keys())
+        else:
+            levels_to_append = list(range(1, 7))
+        level_keys = [f"level_{level}" for level in levels_to_append]
+
+        # Attribute values land at a fixed offset after the base, hierarchy
+        # and timestamp columns
+        attr_offset = len(base_cols) + len(level_keys) + 3
+        attr_index = {attr_id: attr_offset + i for i, attr_id in enumerate(attribute_ids_sorted)}
+        no_values = [None] * len(attribute_ids_sorted)
 
         rows = []
         for tei in teis:
@@ -867,19 +1297,11 @@ class DHIS2ResponseNormalizer:
             ]
 
             # Add hierarchy values
-            if org_unit_level_names:
-                levels_to_append = sorted(org_unit_level_names.keys())
-            else:
-                levels_to_append = list(range(1, 7))
-
             if org_unit_hierarchy and ou_id:
                 hierarchy_info = org_unit_hierarchy.get(ou_id, {})
-                for level in levels_to_append:
-                    level_value = hierarchy_info.get(f"level_{level}", None)
-                    row.append(level_value)
+                row.extend([hierarchy_info.get(key) for key in level_keys])
             else:
-                for _ in levels_to_append:
-                    row.append(None)
+                row.extend([None] * len(level_keys))
 
             # Add timestamp and status values
             row.extend([
@@ -888,15 +1310,10 @@ class DHIS2ResponseNormalizer:
                 tei.get("inactive"),
             ])
 
-            # Build dict of attribute -> value
-            attr_dict = {
-                attr.get("attribute"): attr.get("value")
-                for attr in tei.get("attributes", [])
-            }
-
-            # Append values for each attribute column
-            for attr_id in sorted(attribute_ids):
-                row.append(attr_dict.get(attr_id))
+            # Fill the attribute columns this TEI has values for
+            row.extend(no_values)
+            for attr in tei.get("attributes", []):
+                row[attr_index[attr.get("attribute")]] = attr.get("value")
 
             rows.append(tuple(row))
 
@@ -1024,12 +1441,10 @@ class DHIS2ResponseNormalizer:
         else:
             col_names = [sanitize_dhis2_column_name("value")]
 
-        rows = []
-        for item in items:
-            if isinstance(item, dict):
-                rows.append(tuple(item.get(col, None) for col in items[0].keys()))
-            else:
-                rows.append((item,))
+        if isinstance(items[0], dict):
+            rows = _dict_rows(items, list(items[0]))
+        else:
+            rows = [(item,) for item in items]
 
         return col_names, rows
 
@@ -1050,7 +1465,7 @@ class DHIS2ResponseNormalizer:
                 # ALL columns MUST be SANITIZED
                 if isinstance(items[0], dict):
                     col_names = [sanitize_dhis2_column_name(col) for col in items[0].keys()]
-                    rows = [tuple(item.get(col, None) for col in items[0].keys()) for item in items]
+                    rows = _dict_rows(items, list(items[0]))
                 else:
                     col_names = [sanitize_dhis2_column_name("value")]
                     rows = [(item,) for item in items]
@@ -1058,7 +1473,7 @@ class DHIS2ResponseNormalizer:
                 return col_names, rows
 
         # Last resort: return raw JSON as single column - SANITIZED
-        return [sanitize_dhis2_column_name("data")], [(json.dumps(data),)]
+        return [sanitize_dhis2_column_name("data")], [(_dumps(data),)]
 
     @classmethod
     def normalize(cls, endpoint: str, data: dict, pivot: bool = True, org_unit_hierarchy: dict | None = None, selected_levels: list[int] | None = None, org_unit_level_names: dict | None = None) -> tuple[list[str], list[tuple]]:
@@ -1093,6 +1508,67 @@ class DHIS2ResponseNormalizer:
             return cls.normalize_generic(data)
 
 
+def _build_default_column_schemas() -> dict[str, tuple[dict, ...]]:
+    """Column definitions for the endpoints DHIS2Dialect knows without metadata"""
+    # Default columns for common DHIS2 endpoints - ALL columns MUST be SANITIZED
+    # Note: analytics endpoint uses WIDE format (pe, ou, dx1, dx2, ...) for horizontal data view
+    # This will be expanded with actual data elements when available
+    default_columns = {
+        "analytics": [sanitize_dhis2_column_name(col) for col in ["Period", "OrgUnit"]],  # Base dimensions - data elements added dynamically
+        "dataValueSets": [sanitize_dhis2_column_name(col) for col in ["dataElement", "period", "orgUnit", "value", "storedBy", "created"]],
+        "trackedEntityInstances": [sanitize_dhis2_column_name(col) for col in ["trackedEntityInstance", "orgUnit", "trackedEntityType", "attributes"]],
+        "events": [sanitize_dhis2_column_name(col) for col in ["event", "program", "orgUnit", "eventDate", "dataValues"]],
+        "enrollments": [sanitize_dhis2_column_name(col) for col in ["enrollment", "trackedEntityInstance", "program", "orgUnit", "enrollmentDate"]],
+    }
+
+    schemas = {}
+    for source_table, cols in default_columns.items():
+        columns = []
+        for col in cols:
+            # Define column metadata based on role in tidy data format
+            col_def = {
+                "name": col,
+                "nullable": True,
+                "is_dttm": False,  # Not a datetime column
+            }
+
+            # DIMENSIONS (categorical/groupable columns); the known names
+            # are already in sanitized form
+            if col in _DIM_COLS:
+                col_def.update({
+                    "type": types.String(),  # Always String to prevent numeric conversion
+                    "groupby": True,  # Can be used for grouping
+                    "filterable": True,  # Can be filtered
+                    "verbose_name": col,  # Display name
+                    "is_numeric": False,  # Explicitly NOT numeric - prevents aggregation
+                    "python_date_format": None,  # Not a date
+                    "is_dttm": False,  # Not a required datetime column
+                })
+            # MEASURES (numeric columns that can be aggregated)
+            elif col in _MEASURE_COLS:
+                col_def.update({
+                    "type": types.Float(),  # Numeric type for aggregation
+                    "is_numeric": True,  # Can be aggregated (SUM, AVG, etc.)
+                    "filterable": True,  # Can be filtered
+                    "is_dttm": False,  # Not a datetime column
+                    "verbose_name": col,
+                })
+            else:
+                # Default for other columns
+                col_def.update({
+                    "type": types.String(),
+                    "is_numeric": False,
+                    "filterable": True,
+                })
+
+            columns.append(col_def)
+        schemas[source_table] = tuple(columns)
+    return schemas
+
+
+_DEFAULT_COLUMN_SCHEMAS = _build_default_column_schemas()
+
+
 class DHIS2Dialect(default.DefaultDialect):
     """Minimal SQLAlchemy dialect for DHIS2 API connections"""
 
@@ -1172,99 +1648,116 @@ class DHIS2Dialect(default.DefaultDialect):
         For custom named datasets (e.g., "analytics_version2"), extracts the source table
         and returns appropriate columns based on it.
         """
+        columns = self._reflect_columns(connection, table_name, schema, **kw)
+
+        # Cache column mapping for query translation (sanitized -> display name).
+        # Done here rather than in _reflect_columns so it covers every branch
+        # that returns columns.
+        source_table = table_name.partition('_')[0]
+        try:
+            from flask import g as flask_g
+            if not hasattr(flask_g, 'dhis2_column_map'):
+                flask_g.dhis2_column_map = {}
+            flask_g.dhis2_column_map[source_table] = {
+                col['name']: col.get('verbose_name', col['name']) for col in columns
+            }
+            logger.info("[DHIS2] Cached %d column mappings for %s", len(columns), source_table)
+        except Exception as e:
+            logger.warning("[DHIS2] Could not cache column mappings: %s", e)
+
+        return columns
+
+    @staticmethod
+    def _api_target(connection) -> tuple[str, Any, dict | None]:
+        """
+        Return (base_url, auth, headers) for the DHIS2 server behind connection.
+
+        Reuses what the pooled DHIS2Connection resolved in its constructor,
+        remembered in the connection's info dict, and only parses the engine
+        URL when no DHIS2Connection is reachable.
+        """
+        info = getattr(connection, "info", None)
+        dhis2_conn = info.get("_dhis2_conn") if info is not None else None
+        if dhis2_conn is None:
+            try:
+                dbapi_conn = getattr(connection.connection, "dbapi_connection", None)
+            except Exception:
+                dbapi_conn = None
+            if isinstance(dbapi_conn, DHIS2Connection):
+                dhis2_conn = dbapi_conn
+                if info is not None:
+                    info["_dhis2_conn"] = dhis2_conn
+        if dhis2_conn is not None:
+            return dhis2_conn.base_url, dhis2_conn.auth, dhis2_conn.headers
+
+        from sqlalchemy.engine.url import make_url
+        url = make_url(str(connection.url))
+        base_url = f"https://{url.host}{url.database or '/api'}"
+        auth = (url.username, url.password) if url.username else None
+        return base_url, auth, None
+
+    @staticmethod
+    def _api_session(connection) -> requests.Session | None:
+        """
+        Session for metadata lookups made while reflecting connection.
+
+        Returns the DHIS2Connection's own session so introspection reuses the
+        keep-alive pool its queries already hold open, or None when no
+        DHIS2Connection is reachable; call after _api_target, which remembers
+        that connection.
+        """
+        info = getattr(connection, "info", None)
+        dhis2_conn = info.get("_dhis2_conn") if info is not None else None
+        if dhis2_conn is not None:
+            return dhis2_conn.session
+        return None
+
+    def _reflect_columns(self, connection, table_name, schema=None, **kw):
+        """Build the column list for table_name; see get_columns"""
         # Parse source table from custom dataset name
         # Example: "analytics_version2" -> "analytics"
-        source_table = table_name
-        if '_' in table_name:
-            parsed = table_name.split('_')[0]
-            logger.debug(f"Parsed source table '{parsed}' from dataset name '{table_name}'")
-            source_table = parsed
+        source_table = table_name.partition('_')[0]
+        if source_table != table_name:
+            logger.debug("Parsed source table '%s' from dataset name '%s'", source_table, table_name)
 
-        # Try to get custom columns from connection metadata
+        # Try to get custom columns from connection metadata; these skip every
+        # default and DHIS2 metadata branch below
         try:
-            if hasattr(connection, 'info') and 'endpoint_columns' in connection.info:
-                endpoint_columns = connection.info['endpoint_columns']
+            info = getattr(connection, 'info', None)
+            endpoint_columns = info.get('endpoint_columns') if info is not None else None
+            if endpoint_columns:
                 # Check both original table_name and source_table
-                for name in [table_name, source_table]:
+                for name in (table_name, source_table):
                     if name in endpoint_columns:
-                        return [
-                            {"name": col, "type": types.String(), "nullable": True}
-                            for col in endpoint_columns[name]
-                        ]
+                        # Built column dicts are kept on the connection for as
+                        # long as the configured column list object is unchanged
+                        names = endpoint_columns[name]
+                        built_key = f"_dhis2_built_columns:{name}"
+                        built = info.get(built_key)
+                        if built is None or built[0] is not names:
+                            string_type = types.String()
+                            built = (
+                                names,
+                                tuple(
+                                    {"name": col, "type": string_type, "nullable": True}
+                                    for col in names
+                                ),
+                            )
+                            info[built_key] = built
+                        return [dict(col_def) for col_def in built[1]]
         except Exception as e:
-            logger.debug(f"Could not load custom columns: {e}")
-
-        # Default columns for common DHIS2 endpoints - ALL columns MUST be SANITIZED
-        # Note: analytics endpoint uses WIDE format (pe, ou, dx1, dx2, ...) for horizontal data view
-        # This will be expanded with actual data elements when available
-        default_columns = {
-            "analytics": [sanitize_dhis2_column_name(col) for col in ["Period", "OrgUnit"]],  # Base dimensions - data elements added dynamically
-            "dataValueSets": [sanitize_dhis2_column_name(col) for col in ["dataElement", "period", "orgUnit", "value", "storedBy", "created"]],
-            "trackedEntityInstances": [sanitize_dhis2_column_name(col) for col in ["trackedEntityInstance", "orgUnit", "trackedEntityType", "attributes"]],
-            "events": [sanitize_dhis2_column_name(col) for col in ["event", "program", "orgUnit", "eventDate", "dataValues"]],
-            "enrollments": [sanitize_dhis2_column_name(col) for col in ["enrollment", "trackedEntityInstance", "program", "orgUnit", "enrollmentDate"]],
-        }
-
-        # Use source_table (not table_name) for lookup
-        if source_table in default_columns:
-            columns = []
-            for col in default_columns[source_table]:
-                # Define column metadata based on role in tidy data format
-                col_def = {
-                    "name": col,
-                    "nullable": True,
-                    "is_dttm": False,  # Not a datetime column
-                }
-
-                # DIMENSIONS (categorical/groupable columns)
-                # Compare with sanitized versions of known dimension columns
-                dimension_cols = [sanitize_dhis2_column_name(c) for c in ["Period", "OrgUnit", "DataElement", "period", "orgUnit", "dataElement"]]
-                if col in dimension_cols:
-                    col_def.update({
-                        "type": types.String(),  # Always String to prevent numeric conversion
-                        "groupby": True,  # Can be used for grouping
-                        "filterable": True,  # Can be filtered
-                        "verbose_name": col,  # Display name
-                        "is_numeric": False,  # Explicitly NOT numeric - prevents aggregation
-                        "python_date_format": None,  # Not a date
-                        "is_dttm": False,  # Not a required datetime column
-                    })
-                # MEASURES (numeric columns that can be aggregated)
-                elif col in [sanitize_dhis2_column_name(c) for c in ["Value", "value"]]:
-                    col_def.update({
-                        "type": types.Float(),  # Numeric type for aggregation
-                        "is_numeric": True,  # Can be aggregated (SUM, AVG, etc.)
-                        "filterable": True,  # Can be filtered
-                        "is_dttm": False,  # Not a datetime column
-                        "verbose_name": col,
-                    })
-                else:
-                    # Default for other columns
-                    col_def.update({
-                        "type": types.String(),
-                        "is_numeric": False,
-                        "filterable": True,
-                    })
+            logger.debug("Could not load custom columns: %s", e)
 
-                columns.append(col_def)
-                logger.debug(f"Column '{col}': type={col_def['type']}, groupby={col_def.get('groupby')}, is_numeric={col_def.get('is_numeric')}")
-            
-            # Cache column mapping for query translation (sanitized -> display name)
-            try:
-                from flask import g as flask_g
-                if not hasattr(flask_g, 'dhis2_column_map'):
-                    flask_g.dhis2_column_map = {}
-                flask_g.dhis2_column_map[source_table] = {
-                    col_def['name']: col_def.get('verbose_name', col_def['name']) for col_def in columns
-                }
-                logger.info(f"[DHIS2] Cached {len(columns)} column mappings for {source_table}")
-            except Exception as e:
-                logger.warning(f"[DHIS2] Could not cache column mappings: {e}")
-            
-            return columns
+        # Default columns for common DHIS2 endpoints, built once at import;
+        # callers get their own copies of the column dicts
+        default_schema = _DEFAULT_COLUMN_SCHEMAS.get(source_table)
+        if default_schema is not None:
+            return [dict(col_def) for col_def in default_schema]
 
         # For analytics, try to fetch ALL available indicators and data elements from DHIS2
         # and show them as individual columns
+        # NOTE: unreachable - "analytics" is in _DEFAULT_COLUMN_SCHEMAS, so the
+        # default schema is returned above and this branch never runs
         if source_table == "analytics" or table_name == "analytics":
             try:
                 from sqlalchemy.engine.url import make_url
@@ -1273,7 +1766,7 @@ class DHIS2Dialect(default.DefaultDialect):
                 base_url = f"https://{url.host}{url.database or '/api'}"
                 auth = (url.username, url.password) if url.username else None
 
-                logger.info(f"[DHIS2] Fetching data elements and indicators from {base_url} (limited to first 500 each for performance)")
+                logger.info("[DHIS2] Fetching data elements and indicators from %s (limited to first 500 each for performance)", base_url)
 
                 # Base dimension columns - ALL columns MUST be SANITIZED
                 columns = [
@@ -1307,7 +1800,7 @@ class DHIS2Dialect(default.DefaultDialect):
                 total_items = 0
                 for meta_type, endpoint in metadata_endpoints.items():
                     try:
-                        logger.info(f"[DHIS2] Fetching {meta_type} from {base_url}{endpoint}")
+                        logger.info("[DHIS2] Fetching %s from %s%s", meta_type, base_url, endpoint)
 
                         # Fetch items with pagination for better performance
                         # Limit to first 500 items per endpoint to avoid slowness
@@ -1324,10 +1817,10 @@ class DHIS2Dialect(default.DefaultDialect):
                         )
 
                         if response.status_code == 200:
-                            data = response.json()
+                            data = _loads(response.content)
                             items = data.get(meta_type, [])
 
-                            logger.info(f"[DHIS2] Found {len(items)} {meta_type}")
+                            logger.info("[DHIS2] Found %d %s", len(items), meta_type)
 
                             # Add each data element/indicator as a column
                             for item in items:
@@ -1372,29 +1865,20 @@ class DHIS2Dialect(default.DefaultDialect):
                                 total_items += 1
 
                         else:
-                            logger.warning(f"[DHIS2] Failed to fetch {meta_type}: HTTP {response.status_code}")
+                            logger.warning("[DHIS2] Failed to fetch %s: HTTP %s", meta_type, response.status_code)
 
                     except Exception as e:
-                        logger.error(f"[DHIS2] Error fetching {meta_type}: {e}")
+                        logger.error("[DHIS2] Error fetching %s: %s", meta_type, e)
 
-                logger.info(f"[DHIS2] Total columns discovered: {len(columns)} (2 dimensions + {total_items} data elements)")
-                logger.info(f"[DHIS2] Limited to first 500 items per endpoint for performance")
-
-                if total_items > 0:
-                    logger.info(f"[DHIS2] Sample columns: {[c['name'] for c in columns[:10]]}")
+                logger.info(
+                    "[DHIS2] Total columns discovered: %d (2 dimensions + %d data elements)",
+                    len(columns),
+                    total_items,
+                )
+                logger.info("[DHIS2] Limited to first 500 items per endpoint for performance")
 
-                # Cache column mapping for query translation (sanitized -> display name)
-                try:
-                    from flask import g as flask_g
-                    if not hasattr(flask_g, 'dhis2_column_map'):
-                        flask_g.dhis2_column_map = {}
-                    # Build mapping: {sanitized_name: display_name}
-                    flask_g.dhis2_column_map[source_table or table_name] = {
-                        col['name']: col.get('verbose_name', col['name']) for col in columns
-                    }
-                    logger.info(f"[DHIS2] Cached {len(columns)} column mappings for {source_table or table_name}")
-                except Exception as e:
-                    logger.warning(f"[DHIS2] Could not cache column mappings: {e}")
+                if total_items > 0 and logger.isEnabledFor(logging.INFO):
+                    logger.info("[DHIS2] Sample columns: %s", [c['name'] for c in columns[:10]])
 
                 return columns
 
@@ -1405,14 +1889,10 @@ class DHIS2Dialect(default.DefaultDialect):
         # For dataSets tables, try to fetch specific dataElements
         elif "dataset" in table_name.lower() or source_table == "dataValueSets":
             try:
-                from sqlalchemy.engine.url import make_url
-                url = make_url(str(connection.url))
-
-                base_url = f"https://{url.host}{url.database or '/api'}"
-                auth = (url.username, url.password) if url.username else None
+                base_url, auth, headers = self._api_target(connection)
 
                 # Search for dataset by name
-                response = requests.get(
+                response = (self._api_session(connection) or requests).get(
                     f"{base_url}/dataSets",
                     params={
                         "filter": f"displayName:ilike:{table_name.replace('_', ' ')}",
@@ -1420,11 +1900,12 @@ class DHIS2Dialect(default.DefaultDialect):
                         "paging": "false"
                     },
                     auth=auth,
+                    headers=headers,
                     timeout=5,
                 )
 
                 if response.status_code == 200:
-                    datasets = response.json().get("dataSets", [])
+                    datasets = _loads(response.content).get("dataSets", [])
                     if datasets:
                         dataset = datasets[0]
                         columns = [
@@ -1442,10 +1923,10 @@ class DHIS2Dialect(default.DefaultDialect):
                                 "nullable": True
                             })
 
-                        logger.info(f"Discovered {len(columns)} columns for dataset {table_name}")
+                        logger.info("Discovered %d columns for dataset %s", len(columns), table_name)
                         return columns
             except Exception as e:
-                logger.debug(f"Could not fetch dataElements for {table_name}: {e}")
+                logger.debug("Could not fetch dataElements for %s: %s", table_name, e)
 
         # Fallback: generic columns
         return [
@@ -1495,6 +1976,9 @@ class DHIS2DBAPI:
 class DHIS2Connection:
     """Connection object for DHIS2 API with dynamic parameter support"""
 
+    # Max geoFeatures results kept per connection
+    geo_cache_size = 128
+
     def __init__(self, host=None, username=None, password=None, database=None, **kwargs):
         """
         Initialize DHIS2 connection
@@ -1509,6 +1993,9 @@ class DHIS2Connection:
                 - endpoint_params: Endpoint-specific parameters
                 - timeout: Request timeout
                 - page_size: Default page size
+                - de_chunk_size / ou_chunk_size / pe_chunk_size: Max items per
+                  dimension in a single analytics request
+                - max_workers: Max concurrent analytics requests
         """
         logger.debug(f"DHIS2Connection init - host: {host}, database: {database}, kwargs: {kwargs}")
 
@@ -1527,6 +2014,12 @@ class DHIS2Connection:
         self.timeout = kwargs.get("timeout", 300)  # Increased to 5 minutes for slow DHIS2 servers
         self.page_size = kwargs.get("page_size", 50)
 
+        # Analytics fan-out: dimension chunk sizes and concurrent request limit
+        self.de_chunk_size = kwargs.get("de_chunk_size", 50)
+        self.ou_chunk_size = kwargs.get("ou_chunk_size", 20)
+        self.pe_chunk_size = kwargs.get("pe_chunk_size", 12)
+        self.max_workers = kwargs.get("max_workers", 8)
+
         # Build base URL
         self.base_url = f"https://{self.host}{self.api_path}"
 
@@ -1540,7 +2033,86 @@ class DHIS2Connection:
             self.auth = (self.username, self.password)
             self.headers = {}
 
-        logger.info(f"DHIS2 connection initialized: {self.base_url}")
+        # Server and user that process-wide caches of user-visible data are
+        # keyed by; token users are told apart by a digest of the token
+        self.cache_scope = (
+            self.base_url,
+            self.username or hashlib.sha256(self.password.encode()).hexdigest(),
+        )
+
+        # One session per connection: auth and headers are attached once instead
+        # of being re-applied (and BasicAuth re-encoded) on every request, and
+        # the underlying connection pool is reused across calls.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        if self.auth:
+            self.session.auth = self.auth
+        # Keep enough pooled keep-alive connections for the concurrent chunk and
+        # batch fetchers, and retry transient gateway errors. raise_on_status is
+        # off so callers still see the final response and handle its status.
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Monotonic time the server last answered organisationUnitLevels with
+        # an empty list; repeat calls within _ORG_UNIT_LEVELS_EMPTY_TTL seconds
+        # are served from memory instead of the network
+        self._org_unit_levels_empty_at: float | None = None
+
+        # geoFeatures payloads keyed by (ou_params, display_property,
+        # include_group_sets), plus the keys known to answer 409 so they go
+        # straight to the organisationUnits fallback
+        self._geo_cache: OrderedDict[tuple, list[dict[str, Any]]] = OrderedDict()
+        self._geo_409: set[tuple] = set()
+
+        # Levels of explicitly selected org units, keyed by the ID set; filled
+        # by DHIS2Cursor._fetch_selected_ou_levels
+        self._ou_levels_by_ids: dict[frozenset[str], list[int]] = {}
+        # DHIS2Cursor._fetch_org_unit_hierarchy results:
+        # {ids: (fetched_at, _cache_generation(), hierarchy)}
+        self._ou_hierarchy_cache: dict[frozenset[str], tuple[float, int, dict]] = {}
+
+        # Built from DHIS2_LOADING_CONFIG on first use; see loading_strategy
+        self._loading_strategy = None
+        self._loading_strategy_resolved = False
+
+        logger.info("DHIS2 connection initialized: %s", self.base_url)
+
+    @property
+    def loading_strategy(self):
+        """
+        DHIS2LoadingStrategy for adaptive timeouts, or None when the app does not
+        set DHIS2_LOADING_CONFIG. Built once per connection; the config only
+        changes on process reload.
+        """
+        if not self._loading_strategy_resolved:
+            try:
+                loading_config = current_app.config.get("DHIS2_LOADING_CONFIG")
+            except Exception:
+                # No Flask, or no application context yet: try again next time
+                return None
+
+            if DHIS2LoadingStrategy is not None and loading_config is not None:
+                self._loading_strategy = DHIS2LoadingStrategy(
+                    TimeoutConfig(
+                        base_timeout=loading_config.get("base_timeout", 30),
+                        preview_timeout=loading_config.get("preview_timeout", 10),
+                        large_query_timeout=loading_config.get("large_query_timeout", 300),
+                        timeout_per_data_element=loading_config.get("timeout_per_data_element", 5),
+                        timeout_per_org_unit=loading_config.get("timeout_per_org_unit", 2),
+                    )
+                )
+            self._loading_strategy_resolved = True
+        return self._loading_strategy
 
     def cursor(self):
         """Return a cursor for executing queries"""
@@ -1561,21 +2133,23 @@ class DHIS2Connection:
         Returns:
             List of organisation unit objects with id, displayName, level
         """
+        if not self.username and not self.password:
+            logger.info("No DHIS2 credentials configured, skipping user org unit fetch")
+            return []
+
         try:
             url = f"{self.base_url}/me"
             params = "fields=organisationUnits[id,displayName,level,path]"
 
             logger.info(f"Fetching user org units from {url}?{params}")
 
-            response = requests.get(
+            response = self.session.get(
                 f"{url}?{params}",
-                auth=self.auth,
-                headers=self.headers,
                 timeout=self.timeout,
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = _loads(response.content)
             return data.get("organisationUnits", [])
 
         except Exception as e:
@@ -1599,6 +2173,17 @@ class DHIS2Connection:
         Returns:
             List of geoFeature objects from DHIS2
         """
+        cache_key = (ou_params, display_property, include_group_sets)
+        cached = self._geo_cache.get(cache_key)
+        if cached is not None:
+            self._geo_cache.move_to_end(cache_key)
+            return cached
+
+        if cache_key in self._geo_409:
+            features = self._fetch_org_units_with_coordinates(ou_params)
+            self._cache_geo_features(cache_key, features)
+            return features
+
         try:
             # Build URL - the ou_params already contains the 'ou:' prefix
             # DHIS2 expects format: /geoFeatures?ou=ou:LEVEL-2
@@ -1608,35 +2193,48 @@ class DHIS2Connection:
 
             logger.info(f"Fetching geoFeatures from {url}")
 
-            response = requests.get(
+            response = self.session.get(
                 url,
-                auth=self.auth,
-                headers=self.headers,
                 timeout=self.timeout,
             )
 
             # If 409 Conflict, try alternative approach
             if response.status_code == 409:
                 logger.warning(f"409 Conflict with {ou_params}, trying fallback approach")
-                return self._fetch_org_units_with_coordinates(ou_params)
+                self._geo_409.add(cache_key)
+                features = self._fetch_org_units_with_coordinates(ou_params)
+                self._cache_geo_features(cache_key, features)
+                return features
 
             response.raise_for_status()
 
-            data = response.json()
+            data = _loads(response.content)
 
             # DHIS2 geoFeatures API returns array directly or nested under key
             if isinstance(data, list):
-                return data
+                features = data
             elif isinstance(data, dict):
-                return data.get("geoFeatures", data.get("organisationUnits", []))
+                features = data.get("geoFeatures", data.get("organisationUnits", []))
             else:
                 logger.warning(f"Unexpected geoFeatures response type: {type(data)}")
                 return []
 
+            self._cache_geo_features(cache_key, features)
+            return features
+
         except Exception as e:
             logger.exception(f"Failed to fetch geoFeatures: {e}")
             raise
 
+    def _cache_geo_features(self, cache_key: tuple, features: list[dict[str, Any]]) -> None:
+        """Store a non-empty geoFeatures result, evicting the least recently used"""
+        if not features:
+            return
+        self._geo_cache[cache_key] = features
+        self._geo_cache.move_to_end(cache_key)
+        while len(self._geo_cache) > self.geo_cache_size:
+            self._geo_cache.popitem(last=False)
+
     def _fetch_org_units_with_coordinates(self, ou_params: str) -> list[dict[str, Any]]:
         """
         Fallback method to fetch org units with coordinates from organisationUnits API.
@@ -1675,15 +2273,13 @@ class DHIS2Connection:
 
             logger.info(f"Fallback: Fetching org units from {url}")
 
-            response = requests.get(
+            response = self.session.get(
                 url,
-                auth=self.auth,
-                headers=self.headers,
                 timeout=self.timeout,
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = _loads(response.content)
             org_units = data.get("organisationUnits", [])
 
             # Convert to geoFeatures format
@@ -1693,19 +2289,15 @@ class DHIS2Connection:
                 if not coordinates:
                     continue
 
-                feature_type = ou.get("featureType", "POLYGON")
-                geo_type = {
-                    "POINT": 1,
-                    "POLYGON": 2,
-                    "MULTI_POLYGON": 3,
-                }.get(feature_type, 2)
+                geo_type = _FEATURE_TYPE_CODES.get(ou.get("featureType", "POLYGON"), 2)
+                parent = ou.get("parent") or {}
 
                 geo_features.append({
                     "id": ou.get("id"),
                     "na": ou.get("displayName"),
                     "le": ou.get("level"),
-                    "pi": ou.get("parent", {}).get("id"),
-                    "pn": ou.get("parent", {}).get("displayName"),
+                    "pi": parent.get("id"),
+                    "pn": parent.get("displayName"),
                     "ty": geo_type,
                     "co": coordinates if isinstance(coordinates, str) else json.dumps(coordinates),
                     "hcd": False,
@@ -1727,6 +2319,10 @@ class DHIS2Connection:
         Returns:
             List of organisationUnitLevel objects with id, level, displayName
         """
+        empty_at = self._org_unit_levels_empty_at
+        if empty_at is not None and time.monotonic() - empty_at < _ORG_UNIT_LEVELS_EMPTY_TTL:
+            return []
+
         try:
             fields = "id,level,displayName,created,lastUpdated"
             url = f"{self.base_url}/organisationUnitLevels"
@@ -1734,20 +2330,19 @@ class DHIS2Connection:
 
             logger.info(f"Fetching org unit levels from {url}?{params}")
 
-            response = requests.get(
+            response = self.session.get(
                 f"{url}?{params}",
-                auth=self.auth,
-                headers=self.headers,
                 timeout=self.timeout,
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = _loads(response.content)
             levels = data.get("organisationUnitLevels", [])
             
             if not levels:
                 logger.warning("organisationUnitLevels endpoint returned empty list, trying alternative endpoint")
                 levels = self._fetch_org_unit_levels_alternative()
+                self._org_unit_levels_empty_at = None if levels else time.monotonic()
             else:
                 logger.info(f"Successfully fetched {len(levels)} org unit levels: {[(l.get('level'), l.get('displayName')) for l in levels]}")
             
@@ -1771,15 +2366,13 @@ class DHIS2Connection:
             
             logger.info(f"Trying alternative level fetch from {url}")
             
-            response = requests.get(
+            response = self.session.get(
                 url,
-                auth=self.auth,
-                headers=self.headers,
                 timeout=self.timeout,
             )
             response.raise_for_status()
             
-            data = response.json()
+            data = _loads(response.content)
             levels = data.get("organisationUnitLevels", [])
             
             if levels:
@@ -1818,15 +2411,13 @@ class DHIS2Connection:
                     
                     logger.info(f"Trying organisationUnitLevels with fields={fields}")
                     
-                    response = requests.get(
+                    response = self.session.get(
                         f"{url}?{params}",
-                        auth=self.auth,
-                        headers=self.headers,
                         timeout=self.timeout,
                     )
                     response.raise_for_status()
                     
-                    data = response.json()
+                    data = _loads(response.content)
                     levels = data.get("organisationUnitLevels", [])
                     
                     if levels:
@@ -1856,6 +2447,9 @@ class DHIS2Connection:
         Returns:
             List of organisation unit objects including all descendants
         """
+        if not ou_ids:
+            return []
+
         try:
             all_ous = []
             fields = "id,displayName,level,path,parent[id,displayName]"
@@ -1866,15 +2460,13 @@ class DHIS2Connection:
 
                 logger.info(f"Fetching org unit {ou_id} with descendants from {url}")
 
-                response = requests.get(
+                response = self.session.get(
                     f"{url}?{params}",
-                    auth=self.auth,
-                    headers=self.headers,
                     timeout=self.timeout,
                 )
                 response.raise_for_status()
 
-                data = response.json()
+                data = _loads(response.content)
                 ou = data
                 if ou:
                     all_ous.append(ou)
@@ -1885,15 +2477,13 @@ class DHIS2Connection:
 
                     logger.info(f"Fetching descendants of {ou_id}")
 
-                    descendants_response = requests.get(
+                    descendants_response = self.session.get(
                         descendants_url,
-                        auth=self.auth,
-                        headers=self.headers,
                         timeout=self.timeout,
                     )
                     descendants_response.raise_for_status()
 
-                    descendants_data = descendants_response.json()
+                    descendants_data = _loads(descendants_response.content)
                     descendants = descendants_data.get("organisationUnits", [])
 
                     existing_ids = {o.get("id") for o in all_ous}
@@ -1918,6 +2508,9 @@ class DHIS2Connection:
         Returns:
             List of data element objects with id and displayName
         """
+        if not de_ids:
+            return []
+
         try:
             all_des = []
             fields = "id,displayName"
@@ -1928,15 +2521,13 @@ class DHIS2Connection:
                 
                 logger.info(f"Fetching data element {de_id}")
                 
-                response = requests.get(
+                response = self.session.get(
                     f"{url}?{params}",
-                    auth=self.auth,
-                    headers=self.headers,
                     timeout=self.timeout,
                 )
                 response.raise_for_status()
                 
-                data = response.json()
+                data = _loads(response.content)
                 if data and data.get("id"):
                     all_des.append(data)
 
@@ -1968,112 +2559,203 @@ class DHIS2Connection:
 
         Returns:
             Dictionary with rows containing {ou, pe, and data element values}
-        """
-        try:
-            dx_param = ";".join(de_ids)
-            pe_param = ";".join(period_ids)
-
-            # Use custom ou_dimension if provided, otherwise build from ou_ids
-            if ou_dimension:
-                ou_param = ou_dimension
-                logger.info(f"[Analytics API] Using custom ou dimension: {ou_param}")
-            else:
-                ou_param = ";".join(ou_ids)
 
-            url = f"{self.base_url}/analytics"
+        Raises:
+            DHIS2DBAPI.OperationalError: If any analytics request fails; partial
+                results are never returned as if they were complete.
+        """
+        if not (de_ids and period_ids and (ou_ids or ou_dimension)):
+            logger.info("[Analytics API] Empty dx/pe/ou selection, skipping request")
+            return {"rows": []}
 
+        try:
             # Determine ouMode - use explicit ou_mode if provided, else legacy include_children
             # ouMode options: SELECTED (default), CHILDREN, DESCENDANTS, ALL
             effective_ou_mode = ou_mode.upper() if ou_mode else ("DESCENDANTS" if include_children else None)
 
-            if effective_ou_mode:
-                params = (
-                    f"dimension=dx:{dx_param}"
-                    f"&dimension=pe:{pe_param}"
-                    f"&dimension=ou:{ou_param}"
-                    f"&ouMode={effective_ou_mode}"
-                    f"&tableLayout=true"
-                    f"&paging=false"
-                )
-                logger.info(f"[Analytics API] Using ouMode={effective_ou_mode}")
+            # Split each dimension into chunks so every analytics call stays small
+            # enough for DHIS2 to serve quickly. A custom ou_dimension may mix UIDs
+            # with LEVEL-n / keywords, so it is always sent as a single chunk.
+            if ou_dimension:
+                ou_chunks = [ou_dimension]
+                logger.info("[Analytics API] Using custom ou dimension: %s", ou_dimension)
             else:
-                params = (
-                    f"dimension=dx:{dx_param}"
-                    f"&dimension=pe:{pe_param}"
-                    f"&dimension=ou:{ou_param}"
-                    f"&tableLayout=true"
-                    f"&paging=false"
-                )
+                ou_chunks = [";".join(chunk) for chunk in _chunked(ou_ids, self.ou_chunk_size)]
+            de_chunks = [";".join(chunk) for chunk in _chunked(de_ids, self.de_chunk_size)]
+            pe_chunks = [";".join(chunk) for chunk in _chunked(period_ids, self.pe_chunk_size)]
+
+            tasks = list(itertools.product(de_chunks, pe_chunks, ou_chunks))
+
+            logger.info(
+                "[Analytics API] Fetching with de_ids=%s, period_ids=%s, ou_ids=%s, "
+                "ou_mode=%s in %d request(s)",
+                de_ids,
+                period_ids,
+                ou_ids,
+                effective_ou_mode,
+                len(tasks),
+            )
 
-            logger.info(f"[Analytics API] Fetching from {url} with de_ids={de_ids}, period_ids={period_ids}, ou_ids={ou_ids}, ou_mode={effective_ou_mode}")
+            if len(tasks) <= 1:
+                shards = [
+                    self._fetch_analytics_chunk(dx_param, pe_param, ou_param, effective_ou_mode)
+                    for dx_param, pe_param, ou_param in tasks
+                ]
+            else:
+                # requests releases the GIL while waiting on the socket, so a small
+                # thread pool gives real concurrency; max_workers caps the load put
+                # on the DHIS2 server.
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+                    futures = [
+                        executor.submit(
+                            self._fetch_analytics_chunk,
+                            dx_param,
+                            pe_param,
+                            ou_param,
+                            effective_ou_mode,
+                        )
+                        for dx_param, pe_param, ou_param in tasks
+                    ]
+                    # Merge in submission order so row order stays deterministic.
+                    # One failed chunk fails the whole query, so don't start the
+                    # requests that are still queued.
+                    try:
+                        shards = [future.result() for future in futures]
+                    except Exception:
+                        for future in futures:
+                            future.cancel()
+                        raise
+
+            # The chunks partition dx, pe and ou, so two shards only share an
+            # (ou, pe) key when they hold different data elements for it; update()
+            # adds those columns rather than overwriting values.
+            row_map: dict[tuple[str, str], dict[str, Any]] = {}
+            for shard in shards:
+                for key, shard_row in shard.items():
+                    if key in row_map:
+                        row_map[key].update(shard_row)
+                    else:
+                        row_map[key] = shard_row
 
-            response = requests.get(
-                f"{url}?{params}",
-                auth=self.auth,
-                headers=self.headers,
-                timeout=self.timeout,
+            rows = list(row_map.values())
+            logger.info(
+                "[Analytics API] Merged %d response(s) into %d unique ou/period combinations",
+                len(tasks),
+                len(rows),
             )
-            response.raise_for_status()
 
-            data = response.json()
-            logger.info(f"[Analytics API] Response status: success, keys: {list(data.keys())}")
-            
-            rows = []
+            return {"rows": rows}
 
-            if "rows" in data:
-                raw_rows = data.get("rows", [])
-                logger.info(f"[Analytics API] Found {len(raw_rows)} raw rows from analytics")
-                
-                headers = data.get("headers", [])
-                dx_idx = next(
-                    (i for i, h in enumerate(headers) if h.get("name") == "dx"),
-                    -1,
-                )
-                pe_idx = next(
-                    (i for i, h in enumerate(headers) if h.get("name") == "pe"),
-                    -1,
-                )
-                ou_idx = next(
-                    (i for i, h in enumerate(headers) if h.get("name") == "ou"),
-                    -1,
-                )
-                value_idx = next(
-                    (i for i, h in enumerate(headers)
-                     if h.get("name") == "value"),
-                    -1,
-                )
+        except requests.exceptions.HTTPError as e:
+            logger.error("[Analytics API] HTTP error: %s", e)
+            raise DHIS2DBAPI.OperationalError(f"DHIS2 analytics error: {e}") from e
+        except requests.exceptions.Timeout as e:
+            logger.error("[Analytics API] Request timeout")
+            raise DHIS2DBAPI.OperationalError("Analytics request timeout") from e
+        except Exception as e:
+            logger.exception("[Analytics API] Failed to fetch analytics data: %s", e)
+            raise DHIS2DBAPI.OperationalError(f"Analytics request failed: {e}") from e
 
-                logger.info(f"[Analytics API] Column indices: dx={dx_idx}, pe={pe_idx}, ou={ou_idx}, value={value_idx}")
+    def _fetch_analytics_chunk(
+        self,
+        dx_param: str,
+        pe_param: str,
+        ou_param: str,
+        ou_mode: str | None,
+    ) -> dict[tuple[str, str], dict[str, Any]]:
+        """
+        Fetch one analytics request and pivot it into {(ou, pe): {ou, pe, dx: value}}.
+
+        Used by fetch_analytics_data for each dx/pe/ou chunk; the caller merges the
+        returned shards.
+        """
+        url = f"{self.base_url}/analytics"
+
+        if ou_mode:
+            params = (
+                f"dimension=dx:{dx_param}"
+                f"&dimension=pe:{pe_param}"
+                f"&dimension=ou:{ou_param}"
+                f"&ouMode={ou_mode}"
+                f"&tableLayout=true"
+                f"&paging=false"
+            )
+        else:
+            params = (
+                f"dimension=dx:{dx_param}"
+                f"&dimension=pe:{pe_param}"
+                f"&dimension=ou:{ou_param}"
+                f"&tableLayout=true"
+                f"&paging=false"
+            )
 
-                row_map = {}
+        response = self.session.get(
+            f"{url}?{params}",
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
 
-                for row in raw_rows:
-                    dx_val = row[dx_idx] if dx_idx >= 0 else ""
-                    pe_val = row[pe_idx] if pe_idx >= 0 else ""
-                    ou_val = row[ou_idx] if ou_idx >= 0 else ""
-                    val = row[value_idx] if value_idx >= 0 else ""
+        data = _loads(response.content)
+        # Drop the raw body before pivoting; only the decoded rows are needed
+        response.close()
+        del response
 
-                    key = (ou_val, pe_val)
+        row_map: dict[tuple[str, str], dict[str, Any]] = {}
 
-                    if key not in row_map:
-                        row_map[key] = {
-                            "ou": ou_val,
-                            "pe": pe_val,
-                        }
+        if "rows" not in data:
+            logger.warning("[Analytics API] No 'rows' key in response. Available keys: %s", list(data.keys()))
+            return row_map
 
-                    if dx_val:
-                        row_map[key][dx_val] = val
+        raw_rows = data.get("rows", [])
+        logger.info("[Analytics API] Found %d raw rows from analytics", len(raw_rows))
 
-                rows = list(row_map.values())
-                logger.info(f"[Analytics API] Pivoted {len(raw_rows)} rows into {len(rows)} unique ou/period combinations")
-            else:
-                logger.warning(f"[Analytics API] No 'rows' key in response. Available keys: {list(data.keys())}")
+        headers = data.get("headers", [])
+        idx_by_name: dict[str, int] = {}
+        for i, h in enumerate(headers):
+            # Keep the first occurrence, matching the previous per-name scans
+            idx_by_name.setdefault(h.get("name"), i)
+        dx_idx = idx_by_name.get("dx", -1)
+        pe_idx = idx_by_name.get("pe", -1)
+        ou_idx = idx_by_name.get("ou", -1)
+        value_idx = idx_by_name.get("value", -1)
+
+        logger.info(
+            "[Analytics API] Column indices: dx=%d, pe=%d, ou=%d, value=%d",
+            dx_idx,
+            pe_idx,
+            ou_idx,
+            value_idx,
+        )
 
-            return {"rows": rows}
+        indices = (ou_idx, pe_idx, dx_idx, value_idx)
+        if min(indices) >= 0:
+            extract = operator.itemgetter(*indices)
+        else:
+            def extract(row):
+                return tuple(row[i] if i >= 0 else "" for i in indices)
+
+        # dx/pe/ou come from small vocabularies repeated on every row; interning
+        # them lets all row_map keys share one string object per UID and makes
+        # the (ou, pe) tuple hashing reuse the cached str hash.
+        intern = sys.intern
+        for row in raw_rows:
+            ou_val, pe_val, dx_val, val = extract(row)
+            ou_val = intern(ou_val)
+            pe_val = intern(pe_val)
+            dx_val = intern(dx_val)
+
+            key = (ou_val, pe_val)
+
+            if key not in row_map:
+                row_map[key] = {
+                    "ou": ou_val,
+                    "pe": pe_val,
+                }
 
-        except Exception as e:
-            logger.exception(f"[Analytics API] Failed to fetch analytics data: {e}")
-            return {"rows": []}
+            if dx_val:
+                row_map[key][dx_val] = val
+
+        return row_map
 
     def fetch_data_values(self, params: dict[str, Any]) -> dict[str, Any]:
         """
@@ -2097,21 +2779,20 @@ class DHIS2Connection:
         """
         try:
             url = f"{self.base_url}/dataValueSets"
-            query_string = "&".join(f"{k}={v}" for k, v in params.items())
-            if query_string:
-                url = f"{url}?{query_string}"
+            # Same encoding as analytics requests: values are percent-encoded,
+            # DHIS2 list and dimension separators stay readable
+            if params:
+                url = f"{url}?{urlencode(params, quote_via=quote, safe=':;,-')}"
 
             logger.info(f"Fetching data values from {url}")
 
-            response = requests.get(
+            response = self.session.get(
                 url,
-                auth=self.auth,
-                headers=self.headers,
                 timeout=self.timeout,
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = _loads(response.content)
             return data
 
         except Exception as e:
@@ -2119,25 +2800,44 @@ class DHIS2Connection:
             raise
 
     def close(self):
-        """Close connection"""
+        """Close connection and release the pooled HTTP connections"""
+        if self.session is not None:
+            try:
+                self.session.close()
+            finally:
+                self.session = None
         logger.debug("DHIS2 connection closed")
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 
 class DHIS2Cursor:
     """Cursor object for executing DHIS2 API queries with dynamic parameters"""
 
+    # Org unit IDs per organisationUnits level lookup (~12 URL bytes per ID)
+    OU_LEVEL_BATCH_SIZE = 200
+    # Distinct org unit sets remembered per connection before the memo resets
+    OU_LEVEL_MEMO_SIZE = 256
+    # URL length organisationUnits hierarchy requests are packed up to; stays
+    # under the common 8 KB request-line limit of DHIS2's servlet containers
+    # and proxies (~500 IDs per request)
+    OU_HIERARCHY_MAX_URL_LENGTH = 6000
+
     def __init__(self, connection: DHIS2Connection):
         self.connection = connection
         self._description = None
         self.rowcount = -1
         self._rows = []
+        self._cursor_idx = 0
 
     def _parse_endpoint_from_query(self, query: str) -> str:
         """Extract endpoint name from SQL query (FROM clause)"""
-        # Simple regex to extract table name from SELECT ... FROM table_name
-        match = re.search(r'FROM\s+(\w+)', query, re.IGNORECASE)
-        if match:
-            endpoint = match.group(1)
+        endpoint = _table_from_query(query)
+        if endpoint:
             # Don't use schema name as endpoint
             if endpoint.lower() == 'dhis2':
                 logger.warning("Ignoring 'dhis2' as endpoint - using default 'analytics'")
@@ -2151,7 +2851,7 @@ class DHIS2Cursor:
         Returns a list of column names in the order they appear.
         """
         # Match SELECT clause - handles SELECT col1, col2 FROM ...
-        select_match = re.search(r'SELECT\s+(.+?)\s+FROM', query, re.IGNORECASE | re.DOTALL)
+        select_match = _RE_SELECT.search(query)
         if not select_match:
             return []
         
@@ -2186,79 +2886,37 @@ class DHIS2Cursor:
         We need to identify which columns are dimensions vs data values.
         """
         dimension_specs = []
-        
-        # DHIS2 dimension column patterns
-        # Maps column name patterns to DHIS2 dimension prefixes
-        dimension_patterns = {
-            # Organisation/Location dimensions
-            ('orgunit', 'ou'): ['orgunit', 'organisation_unit', 'ou', 'organisationunit'],
-            
-            # Time dimensions
-            ('period', 'pe'): ['period', 'pe', 'time', 'date', 'year', 'month', 'quarter'],
-            
-            # Data element dimensions
-            ('dataelement', 'dx'): ['dataelement', 'data_element', 'dx', 'element', 'indicator'],
-            
-            # Category/Category Option dimensions
-            ('category', 'ca'): ['category', 'ca'],
-            ('categoryoption', 'co'): ['categoryoption', 'category_option', 'co'],
-            
-            # Program Stage
-            ('programstage', 'ps'): ['programstage', 'program_stage', 'ps'],
-            
-            # Tracked Entity
-            ('trackedentity', 'te'): ['trackedentity', 'tracked_entity', 'te'],
-            
-            # Organisation Unit Group
-            ('organisationunitgroup', 'oug'): ['organisationunitgroup', 'organisation_unit_group', 'oug'],
-        }
-        
-        # Known metric/value column names that should NOT be dimensions
-        metric_patterns = [
-            'value', 'values', 'count', 'sum', 'avg', 'average', 'min', 'maximum', 'max', 
-            'stddev', 'variance', 'total', 'data', 'result',
-            # Aggregation functions
-            'ccount', 'countnnon', 'stddev', 'variance', 'sum_sq',
-        ]
-        
+
         for col in columns:
-            col_sanitized = sanitize_dhis2_column_name(col.lower())
-            col_lower = col.lower()
-            original_col = col
-            
-            # Skip if it's a known metric/value column
-            is_metric = False
-            for metric_pat in metric_patterns:
-                if metric_pat in col_lower:
-                    is_metric = True
-                    break
-            
-            if is_metric:
-                logger.debug(f"[DHIS2] Skipping metric/value column: {col}")
-                continue
-            
-            # Try to match to a DHIS2 dimension
-            matched = False
-            for (pattern_key, dimension_prefix), patterns in dimension_patterns.items():
-                for pattern in patterns:
-                    pattern_sanitized = sanitize_dhis2_column_name(pattern.lower())
-                    if pattern_sanitized in col_sanitized or col_sanitized.endswith(pattern_sanitized):
-                        # Format the dimension spec
-                        # Use the original column name as the value
-                        dimension_specs.append(f"{dimension_prefix}:{original_col}")
-                        logger.debug(f"[DHIS2] Mapped column '{col}' to dimension '{dimension_prefix}'")
-                        matched = True
-                        break
-                if matched:
-                    break
-            
-            if not matched:
-                # If no pattern matched, still try to treat as dimension
-                # (fallback for unknown dimension types)
-                logger.debug(f"[DHIS2] Column '{col}' didn't match known patterns, will try as generic dimension")
-        
+            dimension_prefix = _dimension_prefix_for_column(col)
+            if dimension_prefix:
+                # Use the original column name as the value
+                dimension_specs.append(f"{dimension_prefix}:{col}")
+                logger.debug("[DHIS2] Mapped column '%s' to dimension '%s'", col, dimension_prefix)
+            else:
+                logger.debug("[DHIS2] Column '%s' is a metric or matched no known dimension pattern", col)
+
         return dimension_specs
 
+    @staticmethod
+    def _parse_param_str(param_str: str, params: dict[str, str]) -> None:
+        """
+        Parse 'key=value' pairs separated by '&' (URL format) or ',' into params.
+
+        Repeated 'dimension' entries are joined with ';' for _make_api_request.
+        """
+        separator = '&' if '&' in param_str else ','
+        for param in param_str.split(separator):
+            key, sep, value = param.partition('=')
+            if not sep:
+                continue
+            key = key.strip()
+            value = value.strip()
+            if key == 'dimension' and key in params:
+                params[key] = f"{params[key]};{value}"
+            else:
+                params[key] = value
+
     def _extract_query_params(self, query: str) -> dict[str, str]:
         """
         Extract query parameters from SQL WHERE clause or comments OR cached params
@@ -2273,65 +2931,35 @@ class DHIS2Cursor:
         This ensures preview/ad-hoc queries with SQL comments always use fresh parameters,
         while saved datasets can still use cached parameters.
         """
-        from urllib.parse import unquote
-
         params = {}
-        from_match = re.search(r'FROM\s+(\w+)', query, re.IGNORECASE)
-        table_name = from_match.group(1) if from_match else "analytics"
-
-        # FIRST: Check SQL comments (highest priority - always current/live)
-        # Extract from SQL block comments (/* DHIS2: key=value&key2=value2 */)
-        block_comment_match = re.search(r'/\*\s*DHIS2:\s*(.+?)\s*\*/', query, re.IGNORECASE | re.DOTALL)
-        if block_comment_match:
-            param_str = block_comment_match.group(1).strip()
-            # URL decode the parameter string first
-            param_str = unquote(param_str)
-            # Split by & or , to support both URL format and comma-separated
-            separator = '&' if '&' in param_str else ','
-            for param in param_str.split(separator):
-                if '=' in param:
-                    key, value = param.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-
-                    # Handle dimension parameter specially - can appear multiple times
-                    if key == 'dimension':
-                        if key in params:
-                            # Append to existing dimension with semicolon separator for _make_api_request
-                            params[key] = f"{params[key]};{value}"
-                        else:
-                            params[key] = value
-                    else:
-                        params[key] = value
-
-        # Extract from SQL line comments (-- DHIS2: key=value, key2=value2)
-        # Support both comma and ampersand separators (URL format)
-        comment_match = re.search(r'--\s*DHIS2:\s*(.+?)(?:\n|$)', query, re.IGNORECASE)
-        if comment_match:
-            param_str = comment_match.group(1)
-            # URL decode the parameter string first
-            param_str = unquote(param_str)
-            # Split by & or , to support both URL format and comma-separated
-            separator = '&' if '&' in param_str else ','
-            for param in param_str.split(separator):
-                if '=' in param:
-                    key, value = param.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-
-                    # Handle dimension parameter specially - can appear multiple times
-                    if key == 'dimension':
-                        if key in params:
-                            # Append to existing dimension with semicolon separator for _make_api_request
-                            params[key] = f"{params[key]};{value}"
-                        else:
-                            params[key] = value
-                    else:
-                        params[key] = value
+        # Interned: used as the key for the Flask g, cache and miss lookups below
+        table_name = _table_from_query(query) or "analytics"
+
+        # FIRST: Check SQL comments (highest priority - always current/live).
+        # Most queries carry no DHIS2 comment, so skip both regexes unless the
+        # marker is present at all.
+        if "DHIS2:" in query:
+            # Extract from SQL block comments (/* DHIS2: key=value&key2=value2 */)
+            if "/*" in query:
+                block_comment_match = _RE_BLOCK_DHIS2.search(query)
+                if block_comment_match:
+                    param_str = block_comment_match.group(1).strip()
+                    # URL decode the parameter string first
+                    param_str = unquote(param_str)
+                    self._parse_param_str(param_str, params)
+
+            # Extract from SQL line comments (-- DHIS2: key=value, key2=value2)
+            # Support both comma and ampersand separators (URL format)
+            if "--" in query:
+                comment_match = _RE_LINE_DHIS2.search(query)
+                if comment_match:
+                    param_str = comment_match.group(1)
+                    # URL decode the parameter string first
+                    param_str = unquote(param_str)
+                    self._parse_param_str(param_str, params)
 
         # If SQL comments provided parameters, use them (highest priority)
         if params:
-            print(f"[DHIS2] Using parameters from SQL comments: {list(params.keys())}")
             logger.info(f"Using parameters from SQL comments (live/current)")
             return params
 
@@ -2341,18 +2969,8 @@ class DHIS2Cursor:
             if hasattr(flask_g, 'dhis2_dataset_params'):
                 if table_name in flask_g.dhis2_dataset_params:
                     param_str = flask_g.dhis2_dataset_params[table_name]
-                    print(f"[DHIS2] Found params in Flask g for {table_name}: {param_str[:100]}")
                     logger.info(f"Using stored parameters from Flask g for table: {table_name}")
-                    separator = '&' if '&' in param_str else ','
-                    for param in param_str.split(separator):
-                        if '=' in param:
-                            key, value = param.split('=', 1)
-                            key = key.strip()
-                            value = value.strip()
-                            if key == 'dimension':
-                                params[key] = f"{params[key]};{value}" if key in params else value
-                            else:
-                                params[key] = value
+                    self._parse_param_str(param_str, params)
                     if params:
                         return params
         except ImportError:
@@ -2362,32 +2980,20 @@ class DHIS2Cursor:
 
         # THIRD: Check application cache (persists across requests) - Fallback only
         cache_param_str = None
-        try:
-            from superset.extensions import cache_manager
-            # Try to find cached params by table name (we cache with dataset ID pattern)
-            # Search for any cache key matching this table
-            cache_keys = [f"dhis2_params_{i}_{table_name}" for i in range(1, 200)]  # Check dataset IDs 1-200
-            for cache_key in cache_keys:
-                cached = cache_manager.data_cache.get(cache_key)
-                if cached:
-                    cache_param_str = cached
-                    print(f"[DHIS2] Found params in cache for {table_name}: {cache_param_str[:100]}")
+        # Skipped when recently confirmed there are no cached params for this table
+        if not _params_cache_recently_missed(table_name):
+            try:
+                # SqlaTable.get_from_clause keeps a table-name index next to the
+                # per-dataset params key, so one lookup is enough
+                cache_param_str = _cached_dataset_params(table_name)
+                _set_params_cache_miss(table_name, not cache_param_str)
+                if cache_param_str:
                     logger.info(f"Using cached parameters for table: {table_name} (fallback)")
-                    break
-        except Exception as e:
-            logger.warning(f"[DHIS2] Could not check cache: {e}")
+            except Exception as e:
+                logger.warning("[DHIS2] Could not check cache: %s", e)
 
         if cache_param_str:
-            separator = '&' if '&' in cache_param_str else ','
-            for param in cache_param_str.split(separator):
-                if '=' in param:
-                    key, value = param.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    if key == 'dimension':
-                        params[key] = f"{params[key]};{value}" if key in params else value
-                    else:
-                        params[key] = value
+            self._parse_param_str(cache_param_str, params)
             if params:
                 return params
 
@@ -2397,36 +3003,33 @@ class DHIS2Cursor:
         try:
             select_columns = self._extract_select_columns(query)
             if select_columns:
-                print(f"[DHIS2] Extracted SELECT columns: {select_columns}")
                 logger.info(f"Extracted SELECT columns from query: {select_columns}")
                 
                 dimension_specs = self._map_columns_to_dhis2_dimensions(select_columns, query)
                 if dimension_specs:
-                    print(f"[DHIS2] Mapped to DHIS2 dimensions: {dimension_specs}")
                     logger.info(f"Mapped to DHIS2 dimensions: {dimension_specs}")
                     
-                    # Merge with existing dimensions
+                    # Merge with existing dimensions; a selected column replaces
+                    # any existing values for its dimension type
+                    dims = self._parse_dimension_string(params.get('dimension', ''))
                     for spec in dimension_specs:
-                        if 'dimension' in params:
-                            # Check if this dimension type already exists
-                            prefix = spec.split(':')[0]
-                            existing_specs = params['dimension'].split(';')
-                            # Remove old specs with same prefix if any
-                            filtered_specs = [s for s in existing_specs if not s.startswith(prefix + ':')]
-                            filtered_specs.append(spec)
-                            params['dimension'] = ';'.join(filtered_specs)
-                        else:
-                            params['dimension'] = spec
+                        prefix, _, value = spec.partition(':')
+                        dims.pop(prefix, None)
+                        dims[prefix] = value.split(';')
+                    params['dimension'] = ';'.join(
+                        f"{prefix}:{';'.join(values)}" for prefix, values in dims.items()
+                    )
         except Exception as e:
             logger.warning(f"[DHIS2] Error extracting SELECT columns: {e}")
-            print(f"[DHIS2] Error extracting SELECT columns: {e}")
 
-        # FIFTH: Extract from WHERE clause (lowest priority)
-        where_match = re.search(r'WHERE\s+(.+?)(?:ORDER BY|GROUP BY|LIMIT|$)', query, re.IGNORECASE | re.DOTALL)
+        # FIFTH: Extract from WHERE clause (lowest priority). Most analytics
+        # queries have none, and a substring check is far cheaper than letting
+        # the regex fail at every position of the query.
+        where_match = _RE_WHERE.search(query) if "where" in query.lower() else None
         if where_match:
             conditions = where_match.group(1)
             # Parse simple conditions: field='value' or field="value"
-            for match in re.finditer(r'(\w+)\s*=\s*[\'"]([^\'"]+)[\'"]', conditions):
+            for match in _RE_EQ_COND.finditer(conditions):
                 field, value = match.groups()
                 params[field] = value
 
@@ -2451,19 +3054,17 @@ class DHIS2Cursor:
             
             # Or check for period in dimension parameter
             if "dimension" in query_params:
-                dimensions = query_params["dimension"].split(";")
-                has_period = has_period or any(d.startswith("pe:") for d in dimensions)
+                has_period = has_period or "pe" in self._parse_dimension_string(
+                    query_params["dimension"]
+                )
 
             # Only add startDate/endDate if NO period specified
             # (DHIS2 API rule: cannot use period AND startDate/endDate simultaneously)
             if not has_period:
-                from datetime import datetime, timedelta
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=365)  # Last year
-
+                start_date, end_date = _default_date_range()  # Last year
                 merged.update({
-                    "startDate": start_date.strftime("%Y-%m-%d"),
-                    "endDate": end_date.strftime("%Y-%m-%d"),
+                    "startDate": start_date,
+                    "endDate": end_date,
                 })
             else:
                 logger.info("Period dimension detected - omitting startDate/endDate (DHIS2 API rule)")
@@ -2476,13 +3077,10 @@ class DHIS2Cursor:
 
         elif endpoint == "dataValueSets":
             # Default dataValueSets parameters
-            from datetime import datetime, timedelta
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=365)
-
+            start_date, end_date = _default_date_range()
             merged.update({
-                "startDate": start_date.strftime("%Y-%m-%d"),
-                "endDate": end_date.strftime("%Y-%m-%d"),
+                "startDate": start_date,
+                "endDate": end_date,
             })
 
         # Layer 1: Global defaults
@@ -2518,65 +3116,44 @@ class DHIS2Cursor:
             - PAGINATED: Add pagination for large result sets
             - ASYNC_QUEUE: Background processing for very large queries
         """
-        import time
-        start_time = time.time()
+        start_time = time.monotonic()
 
         # ============================================================
         # CACHING LAYER - Check cache before making API request
         # ============================================================
-        try:
-            from superset.db_engine_specs.dhis2_cache import get_dhis2_cache
-            cache = get_dhis2_cache()
-
-            # Check cache first
-            cached_data = cache.get(endpoint, params, self.connection.base_url)
-            if cached_data is not None:
-                cache_time = time.time() - start_time
-                print(f"[DHIS2] ⚡ CACHE HIT for {endpoint} ({cache_time*1000:.1f}ms)")
-                logger.info(f"[DHIS2 Cache] HIT for {endpoint} - returning cached data instantly")
-
-                # Parse the cached response
-                rows = self._parse_response(endpoint, cached_data, query)
-                return rows
-        except ImportError:
+        # The cache is keyed on (endpoint, params), so hits return before the
+        # URL is built: expanding the ou dimension can itself call the API
+        cache = None
+        if get_dhis2_cache is not None:
+            try:
+                cache = get_dhis2_cache()
+
+                # Check cache first
+                cached_data = cache.get(endpoint, params, self.connection.base_url)
+                if cached_data is not None:
+                    cache_time = time.monotonic() - start_time
+                    logger.info("[DHIS2 Cache] HIT for %s (%.1fms)", endpoint, cache_time * 1000)
+
+                    # Parse the cached response
+                    rows = self._parse_response(endpoint, cached_data, query)
+                    return rows
+            except Exception as e:
+                logger.warning("[DHIS2] Cache check failed: %s, proceeding without cache", e)
+                cache = None
+        else:
             logger.debug("[DHIS2] Cache module not available, proceeding without cache")
-            cache = None
-        except Exception as e:
-            logger.warning(f"[DHIS2] Cache check failed: {e}, proceeding without cache")
-            cache = None
 
         # ============================================================
         # LOADING STRATEGY SELECTION - Intelligently choose how to load
         # ============================================================
-        try:
-            from superset.db_engine_specs.dhis2_loading_strategies import (
-                DHIS2LoadingStrategy,
-                TimeoutConfig,
-                LoadStrategy,
-            )
-            from superset.config import get_app
-
-            # Get DHIS2 loading configuration from Superset config
-            try:
-                app = get_app()
-                loading_config = app.config.get("DHIS2_LOADING_CONFIG", {})
-            except Exception:
-                loading_config = {}
-
-            # Create loading strategy instance
-            timeout_config = TimeoutConfig(
-                base_timeout=loading_config.get("base_timeout", 30),
-                preview_timeout=loading_config.get("preview_timeout", 10),
-                large_query_timeout=loading_config.get("large_query_timeout", 300),
-                timeout_per_data_element=loading_config.get("timeout_per_data_element", 5),
-                timeout_per_org_unit=loading_config.get("timeout_per_org_unit", 2),
-            )
-            loading_strategy = DHIS2LoadingStrategy(timeout_config)
-
+        # Adaptive timeouts only apply when DHIS2_LOADING_CONFIG is set;
+        # otherwise the connection timeout is left as configured.
+        loading_strategy = self.connection.loading_strategy
+        if loading_strategy is not None:
             # Extract data elements and org units for complexity calculation
-            dimension_str = params.get("dimension", "")
-            data_elements = self._extract_dimension_values(dimension_str, "dx")
-            org_units = self._extract_dimension_values(dimension_str, "ou")
+            dims = self._parse_dimension_string(params.get("dimension", ""))
+            data_elements = dims.get("dx", [])
+            org_units = dims.get("ou", [])
 
             # Calculate adaptive timeout
             is_preview = "queryLimit" in params or len(data_elements) <= 1
@@ -2587,147 +3164,26 @@ class DHIS2Cursor:
             )
             # Use adaptive timeout for this request
             self.connection.timeout = adaptive_timeout
-
-        except ImportError:
-            logger.debug("[DHIS2] Loading strategy module not available, using default timeout")
-            loading_strategy = None
+        else:
+            logger.debug("[DHIS2] Adaptive loading not configured, using default timeout")
 
         # ============================================================
         # CACHE MISS - Make API request
         # ============================================================
         url = f"{self.connection.base_url}/{endpoint}"
 
-        # Convert separate dx, pe, ou parameters to DHIS2 dimension format
-        # BEFORE: {dx: 'id1;id2', pe: 'LAST_YEAR', ou: 'ouId', ouMode: 'DESCENDANTS'}
-        # AFTER: {dimension: 'dx:id1;id2;pe:LAST_YEAR;ou:ouId;LEVEL-3;LEVEL-4;...'}
-        if "dimension" not in params and any(k in params for k in ["dx", "pe", "ou"]):
-            dimension_parts = []
-            
-            # Add data elements
-            if "dx" in params and params["dx"]:
-                dimension_parts.append(f"dx:{params['dx']}")
-            
-            # Add periods
-            if "pe" in params and params["pe"]:
-                dimension_parts.append(f"pe:{params['pe']}")
-            
-            # Add org units with LEVEL syntax when ouMode=DESCENDANTS
-            # This ensures data is returned at all descendant levels, not just aggregated
-            if "ou" in params and params["ou"]:
-                ou_value = params["ou"]
-                ou_mode = params.get("ouMode", "").upper()
-                data_level_scope = params.get("dataLevelScope", "all_levels").lower()
-
-                # When DESCENDANTS mode is used, we need to add LEVEL-X syntax
-                # to get data at each descendant level instead of just aggregated data
-                # dataLevelScope options:
-                # - all_levels (default): Data at all levels from selected to deepest
-                # - lowest_level: Data ONLY at the lowest/deepest level (leaf nodes)
-                # - children: Data at one level below selected
-                # - selected: Data only at selected org units (no LEVEL syntax)
-                if ou_mode == "DESCENDANTS" or data_level_scope in ["all_levels", "lowest_level", "children"]:
-                    try:
-                        # Fetch org unit levels to know what levels exist
-                        org_unit_level_names = self._fetch_org_unit_levels()
-                        max_level = max(org_unit_level_names.keys()) if org_unit_level_names else 6
-
-                        # Get the levels of selected org units to know starting level
-                        ou_ids = [o.strip() for o in ou_value.split(";") if o.strip() and not o.startswith("LEVEL-")]
-                        if ou_ids:
-                            # Fetch org unit details to get their levels
-                            BATCH_SIZE = 50
-                            selected_levels = []
-                            for batch_start in range(0, len(ou_ids), BATCH_SIZE):
-                                batch_ids = ou_ids[batch_start:batch_start + BATCH_SIZE]
-                                ou_filter = ",".join(batch_ids)
-                                ou_url = f"{self.connection.base_url}/organisationUnits.json?filter=id:in:[{ou_filter}]&fields=id,level&paging=false"
-                                try:
-                                    ou_resp = requests.get(
-                                        ou_url,
-                                        auth=self.connection.auth,
-                                        headers=self.connection.headers,
-                                        timeout=60,
-                                    )
-                                    if ou_resp.status_code == 200:
-                                        for ou in ou_resp.json().get("organisationUnits", []):
-                                            if ou.get("level"):
-                                                selected_levels.append(ou.get("level"))
-                                except Exception as e:
-                                    logger.warning(f"[DHIS2] Could not fetch org unit levels: {e}")
-
-                            if selected_levels:
-                                min_selected_level = min(selected_levels)
-                                level_parts = []
-
-                                if data_level_scope == "lowest_level":
-                                    # Only add the deepest/lowest level
-                                    level_parts.append(f"LEVEL-{max_level}")
-                                    logger.info(f"[DHIS2] Using lowest_level scope: LEVEL-{max_level}")
-                                    print(f"[DHIS2] Using lowest_level scope: LEVEL-{max_level}")
-                                elif data_level_scope == "children":
-                                    # Only add one level below selected
-                                    next_level = min_selected_level + 1
-                                    if next_level <= max_level:
-                                        level_parts.append(f"LEVEL-{next_level}")
-                                        logger.info(f"[DHIS2] Using children scope: LEVEL-{next_level}")
-                                        print(f"[DHIS2] Using children scope: LEVEL-{next_level}")
-                                else:
-                                    # all_levels (default with DESCENDANTS): Add all levels below selected
-                                    for level in range(min_selected_level + 1, max_level + 1):
-                                        level_parts.append(f"LEVEL-{level}")
-                                    logger.info(f"[DHIS2] Using all_levels scope: {level_parts}")
-                                    print(f"[DHIS2] Using all_levels scope: {level_parts}")
-
-                                if level_parts:
-                                    # Combine org unit IDs with LEVEL syntax
-                                    ou_value = f"{ou_value};{';'.join(level_parts)}"
-
-                        # Remove ouMode and dataLevelScope since we're using LEVEL syntax
-                        params.pop("ouMode", None)
-                        params.pop("dataLevelScope", None)
-                    except Exception as e:
-                        logger.warning(f"[DHIS2] Error building LEVEL syntax: {e}")
-                        # Fall back to using ouMode without LEVEL syntax
-
-                dimension_parts.append(f"ou:{ou_value}")
-
-            if dimension_parts:
-                params["dimension"] = ";".join(dimension_parts)
-                # Remove individual parameters - DHIS2 API doesn't recognize them
-                params.pop("dx", None)
-                params.pop("pe", None)
-                params.pop("ou", None)
-                logger.info(f"Converted dx/pe/ou to dimension parameter: {params['dimension']}")
-
-        # Handle dimension parameter specially - DHIS2 requires multiple dimension parameters
-        # Format: dimension=dx:id1;id2;id3;pe:LAST_YEAR;ou:OrgUnit
-        # Split into: dimension=dx:id1;id2;id3&dimension=pe:LAST_YEAR&dimension=ou:OrgUnit
-        query_params = []
-        for key, value in params.items():
-            if key == "dimension" and ";" in value:
-                # Split on dimension prefixes (dx:, pe:, ou:), not all semicolons
-                # Use regex to split only before dimension prefixes
-                import re
-                # Split before dx:, pe:, ou: while keeping the prefix with the value
-                dimension_parts = re.split(r';(?=(?:dx|pe|ou):)', value)
-                for dim in dimension_parts:
-                    if dim:  # Skip empty strings
-                        query_params.append(f"dimension={dim}")
-            else:
-                query_params.append(f"{key}={value}")
+        query_params = self._build_query_param_pairs(params)
 
-        # Build URL with properly formatted parameters
+        # Build URL with properly encoded parameters; DHIS2 dimension syntax
+        # characters are left readable
         if query_params:
-            url = f"{url}?{'&'.join(query_params)}"
+            url = f"{url}?{urlencode(query_params, quote_via=quote, safe=':;,-')}"
 
-        print(f"[DHIS2] 🔄 CACHE MISS - API request URL: {url}")
-        logger.info(f"DHIS2 API request (cache miss): {url}")
+        logger.info("DHIS2 API request (cache miss): %s", url)
 
         try:
-            response = requests.get(
+            response = self.connection.session.get(
                 url,
-                auth=self.connection.auth,
-                headers=self.connection.headers,
                 timeout=self.connection.timeout,
             )
 
@@ -2735,12 +3191,10 @@ class DHIS2Cursor:
             if response.status_code == 409:
                 # Log the actual error message from DHIS2
                 try:
-                    error_data = response.json()
+                    error_data = _loads(response.content)
                     error_msg = error_data.get("message", "Unknown error")
-                    print(f"[DHIS2] 409 Error from API: {error_msg}")
                     logger.warning(f"DHIS2 API 409 for {endpoint} - {error_msg}")
                 except:
-                    print(f"[DHIS2] 409 Error (could not parse response)")
                     logger.warning(f"DHIS2 API 409 for {endpoint} - missing parameters")
 
                 # Return empty dataset with generic columns
@@ -2749,36 +3203,45 @@ class DHIS2Cursor:
 
             response.raise_for_status()
 
-            data = response.json()
+            data = _loads(response.content)
+            # The decoded dict is all that is needed from here on; drop the raw
+            # body so it is not held alongside the dict and the parsed rows
+            response.close()
+            del response
 
             # Debug: Log raw DHIS2 response structure
-            print(f"[DHIS2] Raw API response keys: {list(data.keys())}")
-            if "rows" in data:
-                print(f"[DHIS2] Raw DHIS2 rows count: {len(data.get('rows', []))}")
-                if data.get('rows'):
-                    print(f"[DHIS2] First raw row: {data['rows'][0]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[DHIS2] Raw API response keys: %s", list(data.keys()))
+                if data.get("rows"):
+                    logger.debug(
+                        "[DHIS2] Raw DHIS2 rows count: %d, first raw row: %s",
+                        len(data["rows"]),
+                        data["rows"][0],
+                    )
 
             # ============================================================
             # CACHE STORAGE - Store successful response in cache
             # ============================================================
-            api_time = time.time() - start_time
+            api_time = time.monotonic() - start_time
             if cache is not None:
                 try:
                     cache.set(endpoint, params, data, self.connection.base_url)
-                    print(f"[DHIS2] ✅ Cached response for {endpoint} (API took {api_time*1000:.1f}ms)")
-                    logger.info(f"[DHIS2 Cache] Stored response for {endpoint}")
+                    logger.info(
+                        "[DHIS2 Cache] Stored response for %s (API took %.1fms)",
+                        endpoint,
+                        api_time * 1000,
+                    )
                 except Exception as e:
                     logger.warning(f"[DHIS2 Cache] Failed to store response: {e}")
             else:
-                print(f"[DHIS2] API response received (no cache, took {api_time*1000:.1f}ms)")
+                logger.debug("[DHIS2] API response received (no cache, took %.1fms)", api_time * 1000)
 
             # Parse response based on endpoint structure - pass query for pivot detection
             rows = self._parse_response(endpoint, data, query)
 
-            print(f"[DHIS2] Transformed rows count: {len(rows)}")
-            if rows:
-                print(f"[DHIS2] First transformed row: {rows[0]}")
-            logger.info(f"DHIS2 API returned {len(rows)} rows")
+            if rows and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[DHIS2] First transformed row: %s", rows[0])
+            logger.info("DHIS2 API returned %d rows", len(rows))
             return rows
 
         except requests.exceptions.HTTPError as e:
@@ -2791,31 +3254,191 @@ class DHIS2Cursor:
             logger.error(f"DHIS2 API request failed: {e}")
             raise DHIS2DBAPI.OperationalError(f"API request failed: {e}")
 
-    def _extract_dimension_values(self, dimension_str: str, dimension_type: str) -> list[str]:
+    def _build_query_param_pairs(self, params: dict[str, Any]) -> list[tuple[str, Any]]:
         """
-        Extract specific dimension values from DHIS2 dimension string
+        Turn merged params into (key, value) pairs for the API URL in one pass.
+
+        DHIS2 requires one dimension parameter per dimension type, so a combined
+        "dx:id1;id2;pe:LAST_YEAR;ou:OrgUnit" becomes three dimension pairs.
+        Separate dx/pe/ou params are converted to dimension pairs as well:
+        BEFORE: {dx: 'id1;id2', pe: 'LAST_YEAR', ou: 'ouId', ouMode: 'DESCENDANTS'}
+        AFTER: dimension=dx:id1;id2 & dimension=pe:LAST_YEAR & dimension=ou:ouId;LEVEL-3;...
+
+        params itself is left untouched.
+        """
+        dimension_pairs: list[tuple[str, Any]] = []
+        skip_keys = {"dimension"}
+
+        if "dimension" in params:
+            value = params["dimension"]
+            if ";" in value:
+                # Split on dimension prefixes (dx:, pe:, ou:), not all semicolons,
+                # keeping the prefix with the value
+                dimension_pairs.extend(
+                    ("dimension", dim) for dim in _RE_DIM_SPLIT.split(value) if dim
+                )
+            else:
+                dimension_pairs.append(("dimension", value))
+        elif any(k in params for k in ("dx", "pe", "ou")):
+            # Add data elements
+            if params.get("dx"):
+                dimension_pairs.append(("dimension", f"dx:{params['dx']}"))
+
+            # Add periods
+            if params.get("pe"):
+                dimension_pairs.append(("dimension", f"pe:{params['pe']}"))
+
+            # Add org units, with LEVEL syntax when descendant levels are requested
+            if params.get("ou"):
+                ou_value, uses_level_syntax = self._expand_ou_dimension(params)
+                if uses_level_syntax:
+                    # LEVEL syntax replaces ouMode and dataLevelScope
+                    skip_keys.update(("ouMode", "dataLevelScope"))
+                dimension_pairs.append(("dimension", f"ou:{ou_value}"))
+
+            if dimension_pairs:
+                # DHIS2 API doesn't recognize the individual parameters
+                skip_keys.update(("dx", "pe", "ou"))
+                logger.info(
+                    "Converted dx/pe/ou to dimension parameters: %s",
+                    [d for _, d in dimension_pairs],
+                )
+
+        return dimension_pairs + [
+            (key, value) for key, value in params.items() if key not in skip_keys
+        ]
+
+    def _expand_ou_dimension(self, params: dict[str, Any]) -> tuple[str, bool]:
+        """
+        Build the ou dimension value, adding LEVEL-n tokens for descendant scopes.
+
+        Returns:
+            (ou_value, uses_level_syntax); when uses_level_syntax is False the
+            ouMode/dataLevelScope params must still be sent to DHIS2
+        """
+        ou_value = params["ou"]
+        ou_mode = params.get("ouMode", "").upper()
+        data_level_scope = params.get("dataLevelScope", "all_levels").lower()
+
+        # When DESCENDANTS mode is used, we need to add LEVEL-X syntax
+        # to get data at each descendant level instead of just aggregated data
+        # dataLevelScope options:
+        # - all_levels (default): Data at all levels from selected to deepest
+        # - lowest_level: Data ONLY at the lowest/deepest level (leaf nodes)
+        # - children: Data at one level below selected
+        # - selected: Data only at selected org units (no LEVEL syntax)
+        if not (ou_mode == "DESCENDANTS" or data_level_scope in _LEVEL_SCOPES):
+            return ou_value, False
+
+        try:
+            # Fetch org unit levels to know what levels exist
+            org_unit_level_names = self._fetch_org_unit_levels()
+            max_level = max(org_unit_level_names.keys()) if org_unit_level_names else 6
+
+            # Get the levels of selected org units to know starting level
+            ou_ids = [o.strip() for o in ou_value.split(";") if o.strip() and not o.startswith("LEVEL-")]
+            if ou_ids:
+                # Fetch org unit details to get their levels
+                selected_levels = self._fetch_selected_ou_levels(ou_ids)
+
+                if selected_levels:
+                    min_selected_level = min(selected_levels)
+                    # Any other scope (DESCENDANTS default) is all_levels
+                    scope_levels = _LEVEL_SCOPE_HANDLERS.get(data_level_scope, _all_levels_below)
+                    level_parts = scope_levels(min_selected_level, max_level)
+                    logger.info("[DHIS2] Using %s scope: %s", data_level_scope, level_parts)
+
+                    if level_parts:
+                        # Combine org unit IDs with LEVEL syntax
+                        ou_value = f"{ou_value};{';'.join(level_parts)}"
+
+            return ou_value, True
+        except Exception as e:
+            logger.warning("[DHIS2] Error building LEVEL syntax: %s", e)
+            # Fall back to using ouMode without LEVEL syntax
+            return params["ou"], False
+
+    def _fetch_selected_ou_levels(self, ou_ids: list[str]) -> list[int]:
+        """
+        Return the hierarchy levels of the given org units.
+
+        IDs are fetched in batches of OU_LEVEL_BATCH_SIZE, concurrently when
+        more than one batch is needed. Complete results are memoized on the
+        connection by ID set, so repeated queries over the same org units skip
+        the round-trips.
+        """
+        memo = self.connection._ou_levels_by_ids
+        memo_key = frozenset(ou_ids)
+        if memo_key in memo:
+            return memo[memo_key]
+
+        failed = False
+
+        def fetch_batch(batch_ids: list[str]) -> list[int]:
+            nonlocal failed
+            ou_url = (
+                f"{self.connection.base_url}/organisationUnits.json"
+                f"?filter=id:in:[{','.join(batch_ids)}]&fields=id,level&paging=false"
+            )
+            try:
+                ou_resp = self.connection.session.get(ou_url, timeout=60)
+                if ou_resp.status_code == 200:
+                    return [
+                        ou["level"]
+                        for ou in _loads(ou_resp.content).get("organisationUnits", [])
+                        if ou.get("level")
+                    ]
+                failed = True
+            except Exception as e:
+                failed = True
+                logger.warning("[DHIS2] Could not fetch org unit levels: %s", e)
+            return []
+
+        batches = _chunked(ou_ids, self.OU_LEVEL_BATCH_SIZE)
+        if len(batches) == 1:
+            selected_levels = fetch_batch(batches[0])
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.connection.max_workers, len(batches))
+            ) as executor:
+                selected_levels = [
+                    level for levels in executor.map(fetch_batch, batches) for level in levels
+                ]
+
+        if not failed:
+            if len(memo) >= self.OU_LEVEL_MEMO_SIZE:
+                memo.clear()
+            memo[memo_key] = selected_levels
+        return selected_levels
+
+    @staticmethod
+    def _parse_dimension_string(dimension_str: str) -> dict[str, list[str]]:
+        """
+        Parse a combined DHIS2 dimension string in one pass
 
         Args:
             dimension_str: Dimension string like "dx:id1;id2;pe:LAST_YEAR;ou:OU1;OU2"
-            dimension_type: Dimension type to extract ("dx", "pe", or "ou")
 
         Returns:
-            List of values for the specified dimension type
+            Dict mapping dimension type to its values, e.g.
+            {"dx": ["id1", "id2"], "pe": ["LAST_YEAR"], "ou": ["OU1", "OU2"]}
         """
+        dims: dict[str, list[str]] = {}
         if not dimension_str:
-            return []
+            return dims
 
-        values = []
-        parts = dimension_str.split(";")
-
-        for part in parts:
-            if part.startswith(f"{dimension_type}:"):
-                # Extract the value after the dimension prefix
-                value_part = part[len(f"{dimension_type}:") :]
-                if value_part:
-                    values.append(value_part)
+        current: list[str] | None = None
+        for part in dimension_str.split(";"):
+            prefix, sep, value = part.partition(":")
+            if sep and prefix in _DIMENSION_TYPES:
+                current = dims.setdefault(prefix, [])
+            else:
+                # Continuation of the previous dimension, e.g. "id2" or "LEVEL-3"
+                value = part
+            if value and current is not None:
+                current.append(value)
 
-        return values
+        return dims
 
     def _extract_hierarchy_info_from_query(self, query: str) -> tuple[list[int], list[str]]:
         """
@@ -2831,8 +3454,10 @@ class DHIS2Cursor:
     def _fetch_org_unit_hierarchy(self, org_unit_ids: list[str]) -> dict:
         """
         Fetch complete hierarchy information for given org units from DHIS2 API.
-        Uses parent-walking approach (same as dhis2_preview_utils.build_ou_hierarchy)
-        to correctly resolve all ancestors by level.
+        Ancestors are resolved by level from each org unit's `path`.
+
+        Results are memoized on the connection per org unit set for
+        _OU_HIERARCHY_TTL seconds, or until DHIS2CacheService is invalidated.
 
         Returns:
             Dict mapping org unit ID to hierarchy info: {ou_id: {level_1: name, level_2: name, ..., level_6: name}}
@@ -2841,186 +3466,269 @@ class DHIS2Cursor:
             logger.warning("[DHIS2] _fetch_org_unit_hierarchy called with empty org_unit_ids")
             return {}
 
+        memo = self.connection._ou_hierarchy_cache
+        memo_key = frozenset(org_unit_ids)
+        generation = _cache_generation()
+        cached = memo.get(memo_key)
+        if (
+            cached is not None
+            and cached[1] == generation
+            and time.monotonic() - cached[0] < _OU_HIERARCHY_TTL
+        ):
+            return cached[2]
+
+        hierarchy_data = self._build_org_unit_hierarchy(org_unit_ids)
+        if hierarchy_data:
+            if len(memo) >= self.OU_LEVEL_MEMO_SIZE:
+                memo.clear()
+            memo[memo_key] = (time.monotonic(), generation, hierarchy_data)
+        return hierarchy_data
+
+    def _build_org_unit_hierarchy(self, org_unit_ids: list[str]) -> dict:
+        """Fetch and assemble the hierarchy for _fetch_org_unit_hierarchy"""
         try:
-            # Step 1: Fetch all org units with parent info using batch queries
+            # Step 1: fetch the requested org units. Each carries its ancestor
+            # chain in `path` ("/rootId/.../parentId/ouId"), where position n
+            # holds the ancestor at level n + 1; only the levels that become
+            # hierarchy columns are kept.
+            max_levels = len(_HIERARCHY_LEVEL_KEYS)
             ou_names: dict[str, str] = {}
-            ou_levels: dict[str, int] = {}
-            ou_parents: dict[str, str | None] = {}
-            all_parent_ids: set[str] = set()
+            ou_chains: dict[str, tuple[str, ...]] = {}
 
-            BATCH_SIZE = 50
             unique_ou_ids = list(set(org_unit_ids))
             logger.info(f"[DHIS2] _fetch_org_unit_hierarchy: Fetching {len(unique_ou_ids)} unique org units in batches...")
-            print(f"[DHIS2] _fetch_org_unit_hierarchy: Fetching {len(unique_ou_ids)} unique org units")
 
-            for batch_start in range(0, len(unique_ou_ids), BATCH_SIZE):
-                batch_ids = unique_ou_ids[batch_start:batch_start + BATCH_SIZE]
-                ou_filter = ",".join(batch_ids)
-                url = f"{self.connection.base_url}/organisationUnits.json?filter=id:in:[{ou_filter}]&fields=id,name,displayName,level,parent[id]&paging=false"
+            org_units = None
+            if len(unique_ou_ids) == 1:
+                # A single org unit (typical of drill-downs) comes back with its
+                # ancestors' names in one request, which also skips step 2
+                org_units = self._request_org_unit_with_ancestors(unique_ou_ids[0])
+            if org_units is None:
+                org_units = self._fetch_org_unit_batches(unique_ou_ids)
 
+            for ou in org_units:
                 try:
-                    response = requests.get(
-                        url,
-                        auth=self.connection.auth,
-                        headers=self.connection.headers,
-                        timeout=300,
+                    ou_id = ou["id"]
+                except KeyError:
+                    continue
+                ou_names[ou_id] = ou.get("displayName") or ou.get("name") or ou_id
+                path = ou.get("path")
+                if path:
+                    ou_chains[ou_id] = tuple(path.strip("/").split("/", max_levels)[:max_levels])
+
+            # Step 2: every ancestor is already known from the paths, so their
+            # names come from a single round of batches instead of one per level
+            ancestor_ids = set().union(*ou_chains.values()) - ou_names.keys()
+            if ancestor_ids:
+                logger.info("[DHIS2] Fetching %d ancestor org units...", len(ancestor_ids))
+                for ou in self._fetch_org_unit_batches(list(ancestor_ids)):
+                    try:
+                        ou_id = ou["id"]
+                    except KeyError:
+                        continue
+                    ou_names[ou_id] = ou.get("displayName") or ou.get("name") or ou_id
+
+            logger.info("[DHIS2] Total org unit names available: %d", len(ou_names))
+
+            # Step 3: level_n is the path entry at position n - 1. Org units
+            # below the deepest hierarchy column share their ancestors' chain,
+            # so the (read-only) maps are shared per chain.
+            chain_cache: dict[tuple[str, ...], dict[str, str | None]] = {}
+            empty_info: dict[str, str | None] = dict.fromkeys(_HIERARCHY_LEVEL_KEYS)
+            hierarchy_data = {}
+            for ou_id in unique_ou_ids:
+                chain = ou_chains.get(ou_id)
+                if not chain:
+                    hierarchy_data[ou_id] = empty_info
+                    continue
+                hierarchy_info = chain_cache.get(chain)
+                if hierarchy_info is None:
+                    hierarchy_info = dict(empty_info)
+                    hierarchy_info.update(
+                        zip(_HIERARCHY_LEVEL_KEYS, [ou_names.get(a, a) for a in chain])
                     )
+                    chain_cache[chain] = hierarchy_info
+                hierarchy_data[ou_id] = hierarchy_info
 
-                    if response.status_code == 200:
-                        ou_data = response.json().get("organisationUnits", [])
-                        print(f"[DHIS2] Batch {batch_start//BATCH_SIZE + 1}: Got {len(ou_data)} org units from DHIS2")
-                        for ou in ou_data:
-                            ou_id = ou.get("id")
-                            if not ou_id:
-                                continue
-                            ou_names[ou_id] = ou.get("displayName") or ou.get("name") or ou_id
-                            ou_levels[ou_id] = ou.get("level", 0)
-                            parent_obj = ou.get("parent")
-                            parent_id = parent_obj.get("id") if isinstance(parent_obj, dict) else None
-                            ou_parents[ou_id] = parent_id
-
-                            # Collect parent IDs for fetching
-                            if parent_id:
-                                all_parent_ids.add(parent_id)
-
-                            # Debug: Log first few org units
-                            if len(ou_names) <= 3:
-                                print(f"[DHIS2]   OU: {ou_id}, name={ou_names[ou_id]}, level={ou_levels[ou_id]}, parent={parent_id}")
-                    else:
-                        logger.warning(f"[DHIS2] Failed to fetch org units batch: HTTP {response.status_code}")
-                        print(f"[DHIS2] ERROR: Batch fetch failed with HTTP {response.status_code}")
-                except Exception as e:
-                    logger.warning(f"[DHIS2] Error fetching org units batch: {e}")
-
-            logger.info(f"[DHIS2] Fetched {len(ou_names)} org units, found {len(all_parent_ids)} parent IDs")
-
-            # Step 2: Fetch all ancestors by walking up the parent chain
-            # Keep fetching parents until we've resolved all of them
-            max_iterations = 10  # Safety limit for hierarchy depth
-            iteration = 0
-
-            while all_parent_ids and iteration < max_iterations:
-                iteration += 1
-                missing_parents = [p for p in all_parent_ids if p not in ou_names]
+            if hierarchy_data and logger.isEnabledFor(logging.DEBUG):
+                sample_ou = next(iter(hierarchy_data))
+                logger.debug("[DHIS2] Sample hierarchy for %s: %s", sample_ou, hierarchy_data[sample_ou])
 
-                if not missing_parents:
-                    break
+            logger.info(
+                "[DHIS2] _fetch_org_unit_hierarchy completed: %d org units with hierarchy",
+                len(hierarchy_data),
+            )
+            return hierarchy_data
 
-                logger.info(f"[DHIS2] Iteration {iteration}: Fetching {len(missing_parents)} missing parent org units...")
-                new_parent_ids: set[str] = set()
+        except Exception as e:
+            logger.error("[DHIS2] Error in _fetch_org_unit_hierarchy: %s", e, exc_info=True)
+            return {}
 
-                for batch_start in range(0, len(missing_parents), BATCH_SIZE):
-                    batch_ids = missing_parents[batch_start:batch_start + BATCH_SIZE]
-                    anc_filter = ",".join(batch_ids)
-                    anc_url = f"{self.connection.base_url}/organisationUnits.json?filter=id:in:[{anc_filter}]&fields=id,name,displayName,level,parent[id]&paging=false"
+    def _request_org_unit_with_ancestors(self, ou_id: str) -> list[dict] | None:
+        """
+        Fetch one org unit and its ancestors' names for _build_org_unit_hierarchy
 
-                    try:
-                        anc_response = requests.get(
-                            anc_url,
-                            auth=self.connection.auth,
-                            headers=self.connection.headers,
-                            timeout=300,
-                        )
-                        if anc_response.status_code == 200:
-                            ancestors = anc_response.json().get("organisationUnits", [])
-                            for anc in ancestors:
-                                anc_id = anc.get("id")
-                                if not anc_id:
-                                    continue
-                                ou_names[anc_id] = anc.get("displayName") or anc.get("name") or anc_id
-                                ou_levels[anc_id] = anc.get("level", 0)
-                                parent_obj = anc.get("parent")
-                                parent_id = parent_obj.get("id") if isinstance(parent_obj, dict) else None
-                                ou_parents[anc_id] = parent_id
-
-                                if parent_id:
-                                    new_parent_ids.add(parent_id)
-                    except Exception as e:
-                        logger.warning(f"[DHIS2] Error fetching ancestors batch: {e}")
+        Returns the org unit followed by its ancestors, or None when the org
+        unit is already in _OU_CACHE or the request fails so the caller falls
+        back to _fetch_org_unit_batches.
+        """
+        with _OU_CACHE_LOCK:
+            entry = _scope_ou_cache(self.connection.cache_scope).get(ou_id)
+        if entry is not None and time.monotonic() - entry[0] < _OU_CACHE_TTL:
+            return None
 
-                all_parent_ids = new_parent_ids
+        url = (
+            f"{self.connection.base_url}/organisationUnits/{ou_id}.json"
+            f"?fields=id,displayName,path,ancestors[id,displayName]"
+        )
+        try:
+            response = self.connection.session.get(url, timeout=300)
+            if response.status_code != 200:
+                logger.warning("[DHIS2] Failed to fetch org unit %s: HTTP %s", ou_id, response.status_code)
+                return None
+            org_unit = _loads(response.content)
+            response.close()
+        except Exception as e:
+            logger.warning("[DHIS2] Error fetching org unit %s: %s", ou_id, e)
+            return None
+        return [org_unit, *(org_unit.pop("ancestors", None) or [])]
+
+    def _fetch_org_unit_batches(self, ou_ids: list[str]) -> list[dict]:
+        """
+        Fetch id, displayName and path for ou_ids from organisationUnits.
+
+        Org units this user saw in the last _OU_CACHE_TTL seconds are served
+        from the process-wide _OU_CACHE; only the rest are requested. Batches are
+        independent, so they run concurrently on a thread pool bounded by the
+        connection's max_workers. Failed batches are logged and contribute no
+        org units.
+        """
+        scope = self.connection.cache_scope
+        now = time.monotonic()
+        cached_ous: list[dict] = []
+        missing_ids: list[str] = []
+        with _OU_CACHE_LOCK:
+            ou_cache = _scope_ou_cache(scope)
+            for ou_id in ou_ids:
+                entry = ou_cache.get(ou_id)
+                if entry is not None and now - entry[0] < _OU_CACHE_TTL:
+                    ou_cache.move_to_end(ou_id)
+                    cached_ous.append(entry[1])
+                else:
+                    missing_ids.append(ou_id)
 
-            logger.info(f"[DHIS2] Total org unit names available: {len(ou_names)}")
-            print(f"[DHIS2] Total org unit names available: {len(ou_names)} after {iteration} iterations")
+        if not missing_ids:
+            return cached_ous
 
-            # Step 3: Build hierarchy dict for each org unit by walking up parent chain
-            hierarchy_data = {}
-            for ou_id in unique_ou_ids:
-                hierarchy_info = {f'level_{i}': None for i in range(1, 7)}
+        fetched_ous = self._request_org_unit_batches(missing_ids)
 
-                # Walk up the parent chain to build ancestors_by_level
-                current_id: str | None = ou_id
-                visited: set[str] = set()
-                depth = 0
-                max_depth = 10
+        now = time.monotonic()
+        with _OU_CACHE_LOCK:
+            ou_cache = _scope_ou_cache(scope)
+            for ou in fetched_ous:
+                if ou.get("id"):
+                    ou_cache[ou["id"]] = (now, ou)
+                    ou_cache.move_to_end(ou["id"])
+            while len(ou_cache) > _OU_CACHE_SIZE:
+                ou_cache.popitem(last=False)
 
-                while current_id and current_id not in visited and depth < max_depth:
-                    visited.add(current_id)
-                    depth += 1
+        return cached_ous + fetched_ous
 
-                    current_level = ou_levels.get(current_id, 0)
-                    current_name = ou_names.get(current_id, current_id)
+    def _request_org_unit_batches(self, ou_ids: list[str]) -> list[dict]:
+        """
+        Request organisationUnits for _fetch_org_unit_batches
 
-                    # Add to hierarchy if valid level
-                    if current_level and 1 <= current_level <= 6:
-                        hierarchy_info[f'level_{current_level}'] = current_name
+        A batch URL that another thread is already requesting for the same
+        user is not sent again; the caller waits for and shares that
+        request's result.
+        """
 
-                    # Move to parent
-                    parent_id = ou_parents.get(current_id)
-                    if parent_id:
-                        current_id = parent_id
-                    else:
-                        break
+        def request_batch(url: str) -> list[dict]:
+            try:
+                response = self.connection.session.get(url, timeout=300)
+                if response.status_code == 200:
+                    # Decode and drop the response before the caller walks
+                    # the units so the raw body is not held alongside them
+                    org_units = _loads(response.content).get("organisationUnits", [])
+                    response.close()
+                    del response
+                    return org_units
+                logger.warning("[DHIS2] Failed to fetch org units batch: HTTP %s", response.status_code)
+            except Exception as e:
+                logger.warning("[DHIS2] Error fetching org units batch: %s", e)
+            return []
 
-                hierarchy_data[ou_id] = hierarchy_info
+        url_prefix = f"{self.connection.base_url}/organisationUnits.json?filter=id:in:["
+        url_suffix = "]&fields=id,displayName,path&paging=false"
 
-            # Log sample for debugging
-            if hierarchy_data:
-                sample_ou = list(hierarchy_data.keys())[0]
-                print(f"[DHIS2] Sample hierarchy for {sample_ou}: {hierarchy_data[sample_ou]}")
-                # Log a few more samples
-                for i, (ou_id, h) in enumerate(hierarchy_data.items()):
-                    if i >= 3:
-                        break
-                    filled_levels = [k for k, v in h.items() if v is not None]
-                    print(f"[DHIS2]   {ou_id}: filled levels = {filled_levels}")
-                logger.info(f"[DHIS2] Sample hierarchy for {sample_ou}: {hierarchy_data[sample_ou]}")
+        def fetch_batch(batch_ids: list[str]) -> list[dict]:
+            url = f"{url_prefix}{','.join(batch_ids)}{url_suffix}"
+            key = (self.connection.cache_scope, url)
+            with _OU_BATCH_INFLIGHT_LOCK:
+                pending = _OU_BATCH_INFLIGHT.get(key)
+                if pending is None:
+                    _OU_BATCH_INFLIGHT[key] = future = Future()
+            if pending is not None:
+                return pending.result()
 
-            logger.info(f"[DHIS2] _fetch_org_unit_hierarchy completed: {len(hierarchy_data)} org units with hierarchy")
-            return hierarchy_data
+            org_units: list[dict] = []
+            try:
+                org_units = request_batch(url)
+            finally:
+                with _OU_BATCH_INFLIGHT_LOCK:
+                    del _OU_BATCH_INFLIGHT[key]
+                future.set_result(org_units)
+            return org_units
+
+        # Sorted so the same org units always produce the same batch URLs
+        batches = _packed(
+            sorted(ou_ids),
+            self.OU_HIERARCHY_MAX_URL_LENGTH - len(url_prefix) - len(url_suffix),
+        )
+        if len(batches) <= 1:
+            return fetch_batch(batches[0]) if batches else []
 
-        except Exception as e:
-            logger.error(f"[DHIS2] Error in _fetch_org_unit_hierarchy: {str(e)}", exc_info=True)
-            return {}
+        with ThreadPoolExecutor(
+            max_workers=min(self.connection.max_workers, len(batches))
+        ) as executor:
+            return [ou for ous in executor.map(fetch_batch, batches) for ou in ous]
 
     def _fetch_org_unit_levels(self) -> dict[int, str]:
         """
         Fetch org unit level names from DHIS2 metadata API
-        
+
+        Results are shared process-wide per base URL for _ORG_UNIT_LEVELS_TTL
+        seconds, or _ORG_UNIT_LEVELS_EMPTY_TTL seconds when nothing came back.
+
         Returns:
             Dict mapping level number to level name: {1: "Country", 2: "Region", ...}
         """
+        base_url = self.connection.base_url
+        cached = _ORG_UNIT_LEVELS_CACHE.get(base_url)
+        if cached is not None:
+            fetched_at, levels_map = cached
+            ttl = _ORG_UNIT_LEVELS_TTL if levels_map else _ORG_UNIT_LEVELS_EMPTY_TTL
+            if time.monotonic() - fetched_at < ttl:
+                return levels_map
+
+        levels_map = self._request_org_unit_levels()
+        _ORG_UNIT_LEVELS_CACHE[base_url] = (time.monotonic(), levels_map)
+        return levels_map
+
+    def _request_org_unit_levels(self) -> dict[int, str]:
+        """Request organisationUnitLevels for _fetch_org_unit_levels"""
         try:
             url = f"{self.connection.base_url}/organisationUnitLevels"
             params = {'fields': 'level,displayName', 'paging': 'false'}
             
-            response = requests.get(
+            response = self.connection.session.get(
                 url,
-                auth=self.connection.auth,
-                headers=self.connection.headers,
                 timeout=self.connection.timeout,
                 params=params,
             )
             
             if response.status_code == 200:
-                data = response.json()
-                levels_map = {}
-                for level in data.get('organisationUnitLevels', []):
-                    level_num = level.get('level')
-                    level_name = level.get('displayName', f'Level_{level_num}')
-                    if level_num:
-                        levels_map[level_num] = level_name
-                
+                levels_map = _parse_org_unit_levels(_loads(response.content))
                 logger.info(f"Fetched org unit levels: {levels_map}")
                 return levels_map
             else:
@@ -3039,9 +3747,9 @@ class DHIS2Cursor:
             data: JSON response from DHIS2 API
             query: Original SQL query (for pivot detection)
         """
-        print(f"[DHIS2] Parsing response for endpoint: {endpoint}")
-        print(f"[DHIS2] Response keys: {list(data.keys())}")
-        print(f"[DHIS2] Response sample: {str(data)[:500]}")
+        logger.debug("[DHIS2] Parsing response for endpoint: %s", endpoint)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DHIS2] Response keys: %s", list(data.keys()))
 
         # Use WIDE/PIVOTED format for analytics data - Period + Hierarchy levels + Data elements as columns
         # Wide format enables:
@@ -3053,9 +3761,7 @@ class DHIS2Cursor:
         # WIDE format provides hierarchy context needed for cascade-filtered maps
         should_pivot = True  # Use WIDE format for hierarchy level columns
 
-        format_msg = "WIDE/PIVOTED format (Period, Level_1_Name, Level_2_Name, ..., DX1, DX2, ...)" if should_pivot else "LONG format"
-        print(f"[DHIS2] Using {format_msg} for {endpoint}")
-        logger.info(f"Using {'wide/pivoted' if should_pivot else 'long'} format for {endpoint}")
+        logger.info("Using %s format for %s", "wide/pivoted" if should_pivot else "long", endpoint)
 
         # Fetch org unit level names for column naming
         org_unit_level_names = self._fetch_org_unit_levels()
@@ -3070,55 +3776,41 @@ class DHIS2Cursor:
             if endpoint == "analytics" and "rows" in data:
                 # Find the ou column index from headers
                 headers = data.get("headers", [])
-                print(f"[DHIS2] Analytics headers: {headers}")
                 ou_idx = None
                 for idx, h in enumerate(headers):
                     header_name = h.get("name") if isinstance(h, dict) else h
                     header_col = h.get("column") if isinstance(h, dict) else None
                     if header_name == "ou" or header_col == "ou":
                         ou_idx = idx
-                        print(f"[DHIS2] Found 'ou' column at index {ou_idx}")
                         break
 
                 if ou_idx is not None:
-                    rows_data = data.get("rows", [])
-                    print(f"[DHIS2] Processing {len(rows_data)} rows to extract org unit IDs")
-                    for row in rows_data:
+                    for row in data.get("rows", []):
                         if len(row) > ou_idx and row[ou_idx]:
                             org_units.add(row[ou_idx])
-                    print(f"[DHIS2] Extracted {len(org_units)} unique org unit IDs from rows")
-                    print(f"[DHIS2] Found {len(org_units)} unique org units in analytics response")
+                    logger.debug("[DHIS2] Found %d unique org units in analytics response", len(org_units))
                 else:
-                    print(f"[DHIS2] Warning: Could not find 'ou' column in headers: {headers}")
+                    logger.warning("[DHIS2] Could not find 'ou' column in headers: %s", headers)
 
             elif endpoint == "dataValueSets" and "dataValues" in data:
                 for dv in data.get("dataValues", []):
                     if dv.get("orgUnit"):
                         org_units.add(dv["orgUnit"])
-                print(f"[DHIS2] Found {len(org_units)} unique org units in dataValueSets response")
+                logger.debug("[DHIS2] Found %d unique org units in dataValueSets response", len(org_units))
 
             if org_units:
-                print(f"[DHIS2] Fetching hierarchy for {len(org_units)} org units...")
                 org_unit_hierarchy = self._fetch_org_unit_hierarchy(list(org_units))
-                print(f"[DHIS2] Fetched hierarchy for {len(org_unit_hierarchy)} org units")
-                if org_unit_hierarchy:
-                    # Log sample hierarchy
-                    sample_ou = list(org_unit_hierarchy.keys())[0] if org_unit_hierarchy else None
-                    if sample_ou:
-                        print(f"[DHIS2] Sample hierarchy for {sample_ou}: {org_unit_hierarchy[sample_ou]}")
+                logger.debug(
+                    "[DHIS2] Fetched hierarchy for %d of %d org units",
+                    len(org_unit_hierarchy),
+                    len(org_units),
+                )
             else:
-                print(f"[DHIS2] No org units found in response data")
+                logger.debug("[DHIS2] No org units found in response data")
         except Exception as e:
-            print(f"[DHIS2] Warning: Could not fetch org unit hierarchy: {e}")
-            logger.warning(f"Could not fetch org unit hierarchy: {e}")
+            logger.warning("Could not fetch org unit hierarchy: %s", e)
             org_unit_hierarchy = None
 
-        print(f"[DHIS2] Calling DHIS2ResponseNormalizer.normalize with:")
-        print(f"[DHIS2]   - endpoint: {endpoint}")
-        print(f"[DHIS2]   - pivot: {should_pivot}")
-        print(f"[DHIS2]   - org_unit_hierarchy: {len(org_unit_hierarchy) if org_unit_hierarchy else 'None'} entries")
-        print(f"[DHIS2]   - org_unit_level_names: {org_unit_level_names}")
-
         col_names, rows = DHIS2ResponseNormalizer.normalize(
             endpoint,
             data,
@@ -3128,15 +3820,12 @@ class DHIS2Cursor:
             org_unit_level_names=org_unit_level_names,
         )
 
-        print(f"[DHIS2] Normalized columns: {col_names}")
-        print(f"[DHIS2] Normalized row count: {len(rows)}")
-        if rows:
-            print(f"[DHIS2] First row: {rows[0]}")
+        logger.debug("[DHIS2] Normalized columns: %s", col_names)
 
         # Set cursor description
         self._set_description(col_names)
 
-        logger.info(f"Normalized {len(rows)} rows with {len(col_names)} columns for endpoint {endpoint}")
+        logger.info("Normalized %d rows with %d columns for endpoint %s", len(rows), len(col_names), endpoint)
         return rows
 
     def _set_description(self, col_names: list[str]):
@@ -3154,7 +3843,7 @@ class DHIS2Cursor:
             sanitized_name = sanitize_dhis2_column_name(name)
 
             # Set proper type based on column name
-            if sanitized_name in ["Value", "value"]:
+            if sanitized_name in _MEASURE_COLS:
                 # Value column is numeric (can be aggregated)
                 col_type = types.Float
             else:
@@ -3163,9 +3852,6 @@ class DHIS2Cursor:
 
             self._description.append((sanitized_name, col_type, None, None, None, None, True))
 
-        sanitized_cols = [desc[0] for desc in self._description]
-        print(f"[DHIS2] _set_description: original={col_names}, sanitized={sanitized_cols}, types={[desc[1].__name__ for desc in self._description]}")
-
     def _translate_query_column_names(self, query: str, table_name: str) -> str:
         """
         Translate unsanitized column names in GROUP BY and ORDER BY clauses to sanitized names.
@@ -3186,15 +3872,17 @@ class DHIS2Cursor:
             if hasattr(flask_g, 'dhis2_column_map') and table_name in flask_g.dhis2_column_map:
                 column_map = flask_g.dhis2_column_map[table_name]
                 # column_map is {sanitized: original} - we need reverse: {original: sanitized}
-                reverse_map = {v: k for k, v in column_map.items()}
-                
-                # Replace unsanitized names with sanitized ones in GROUP BY and ORDER BY
-                # Match quoted and unquoted column names
-                for original, sanitized in reverse_map.items():
-                    # Match quoted versions: "105-EP01a. Suspected fever"
-                    query = query.replace(f'"{original}"', f'"{sanitized}"')
-                    # Also handle without quotes
-                    query = query.replace(f"'{original}'", f"'{sanitized}'")
+                reverse_map = {v: k for k, v in column_map.items() if v != k}
+                if not reverse_map:
+                    return query
+
+                # Replace single- or double-quoted unsanitized names with the
+                # sanitized ones in one pass over the query
+                pattern = _column_translation_pattern(frozenset(reverse_map))
+                query = pattern.sub(
+                    lambda m: f"{m.group(1)}{reverse_map[m.group(2)]}{m.group(1)}",
+                    query,
+                )
             
             return query
         except Exception as e:
@@ -3206,32 +3894,28 @@ class DHIS2Cursor:
         """
         Execute SQL query by translating to DHIS2 API call with dynamic parameters
         """
-        print(f"[DHIS2] Executing query: {query}")
-        logger.info(f"Executing DHIS2 query: {query}")
+        logger.info("Executing DHIS2 query: %s", query)
         
         # Extract table name and translate column references
-        from_match = re.search(r'FROM\s+(\w+)', query, re.IGNORECASE)
-        table_name = from_match.group(1) if from_match else "analytics"
+        table_name = _table_from_query(query) or "analytics"
         query = self._translate_query_column_names(query, table_name)
 
         # Parse query to get endpoint and parameters
         endpoint = self._parse_endpoint_from_query(query)
-        print(f"[DHIS2] Parsed endpoint: {endpoint}")
-        logger.info(f"Parsed endpoint: {endpoint}")
+        logger.info("Parsed endpoint: %s", endpoint)
 
         query_params = self._extract_query_params(query)
-        print(f"[DHIS2] Query params: {query_params}")
-        logger.info(f"Query params: {query_params}")
+        logger.debug("Query params: %s", query_params)
 
         # Merge all parameter sources
         api_params = self._merge_params(endpoint, query_params)
-        print(f"[DHIS2] Merged params: {api_params}")
-        logger.info(f"Merged params: {api_params}")
+        logger.info("Merged params: %s", api_params)
 
         # Execute API request - pass query for pivot detection
         self._rows = self._make_api_request(endpoint, api_params, query)
+        self._cursor_idx = 0
         self.rowcount = len(self._rows)
-        print(f"[DHIS2] Fetched {self.rowcount} rows")
+        logger.debug("[DHIS2] Fetched %d rows", self.rowcount)
 
     def fetchall(self):
         """
@@ -3245,97 +3929,91 @@ class DHIS2Cursor:
         - Pandas from inferring wrong types
         - Chart code from accidentally aggregating dimension columns
         """
-        print(f"[DHIS2] fetchall() called - returning {len(self._rows)} rows")
-        logger.info(f"[DHIS2] fetchall() - Row count: {len(self._rows)}")
-
-        if not self._rows:
-            return self._rows
-
-        print(f"[DHIS2] fetchall() - First row type: {type(self._rows[0])}")
-        print(f"[DHIS2] fetchall() - First row (original): {self._rows[0]}")
-        print(f"[DHIS2] fetchall() - Column count from description: {len(self._description)}")
+        # Rows already taken by fetchone/fetchmany are not returned again
+        rows = self._rows[self._cursor_idx:] if self._cursor_idx else self._rows
+        if not rows:
+            return rows
 
         # Extract column names from cursor description
         column_names = [desc[0] for desc in self._description]
-        logger.info(f"[DHIS2] fetchall() column_names: {column_names}")
-        logger.info(f"[DHIS2] fetchall() column_names length: {len(column_names)}")
-
-        if self._rows:
-            row_0 = self._rows[0]
-            logger.info(f"[DHIS2] First row values count: {len(row_0) if hasattr(row_0, '__len__') else 1}")
-            logger.info(f"[DHIS2] First row values: {row_0}")
-
-        # Process each row with strict type enforcement
-        fixed_rows = []
-        for row_idx, row in enumerate(self._rows):
-            fixed_row = []
-            for col_idx, (col_name, value) in enumerate(zip(column_names, row)):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DHIS2] fetchall() columns: %s", column_names)
+            logger.debug("[DHIS2] fetchall() first row (original): %s", rows[0])
+
+        # Columns are classified once up front instead of per cell. Each row
+        # keeps its values for the described columns only, as zip(column_names,
+        # row) did; rows shorter than the description stay short.
+        width = len(column_names)
+        dim_idx = [idx for idx, name in enumerate(column_names) if name in _DIM_COLS]
+        measure_idx = [idx for idx, name in enumerate(column_names) if name in _MEASURE_COLS]
+
+        if not dim_idx and not measure_idx:
+            # Other columns: keep as-is (non-numeric strings are already strings)
+            fixed_rows = [tuple(row[:width]) for row in rows]
+        else:
+            fixed_rows = []
+            invalid = 0
+            for row in rows:
+                fixed_row = list(row[:width])
+                row_width = len(fixed_row)
                 # DIMENSION columns: ALWAYS string (never aggregate)
-                if col_name in ['Period', 'OrgUnit', 'DataElement', 'period', 'orgUnit', 'dataElement']:
-                    # Force to string to prevent Pandas from treating "105-..." as numeric
-                    fixed_value = str(value) if value is not None else None
-                    fixed_row.append(fixed_value)
-                    if row_idx == 0 and col_idx < 3:
-                        logger.info(f"[DHIS2] Row 0 col {col_idx} ({col_name}): {value} -> {fixed_value} (STRING)")
-
+                for idx in dim_idx:
+                    if idx < row_width:
+                        value = fixed_row[idx]
+                        if value is not None and type(value) is not str:
+                            # Force to string to prevent Pandas from treating "105-..." as numeric
+                            fixed_row[idx] = str(value)
                 # MEASURE columns: ALWAYS float (can aggregate)
-                elif col_name in ['Value', 'value']:
-                    # Safe numeric conversion
-                    try:
-                        fixed_value = float(value) if value is not None else None
-                        fixed_row.append(fixed_value)
-                        if row_idx == 0:
-                            logger.info(f"[DHIS2] Row 0 col {col_idx} ({col_name}): {value} -> {fixed_value} (FLOAT)")
-                    except (ValueError, TypeError):
-                        fixed_row.append(None)
-                        logger.warning(f"[DHIS2] Could not convert {col_name}={value} to float")
-
-                # Other columns: keep as-is
-                else:
-                    # Check if value looks like a dimension (non-numeric string)
-                    # This catches dimension columns that aren't in the known list
-                    if value is not None and isinstance(value, str):
-                        try:
-                            float(value)
-                            # It's a numeric string - could be a value column, keep as-is
-                            fixed_row.append(value)
-                        except ValueError:
-                            # It's a non-numeric string - treat as dimension (force to string)
-                            fixed_row.append(str(value))
-                            if row_idx == 0:
-                                logger.info(f"[DHIS2] Row 0 col {col_idx} ({col_name}): '{value[:30]}...' -> STRING (non-numeric detected)")
-                    else:
-                        fixed_row.append(value)
-
-                    if row_idx == 0 and col_idx < 5:
-                        logger.info(f"[DHIS2] Row 0 col {col_idx} ({col_name}): {value} (PROCESSED)")
-
-            fixed_rows.append(tuple(fixed_row))
-
-        if fixed_rows:
-            print(f"[DHIS2] fetchall() - First row (fixed types): {fixed_rows[0]}")
-            print(f"[DHIS2] fetchall() - Type enforcement: dimensions=STRING, measures=FLOAT")
-            logger.info(f"[DHIS2] fetchall() returning {len(fixed_rows)} rows with {len(column_names)} columns each")
+                for idx in measure_idx:
+                    if idx < row_width:
+                        value = fixed_row[idx]
+                        if value is not None and type(value) is not float:
+                            # Safe numeric conversion
+                            try:
+                                fixed_row[idx] = float(value)
+                            except (ValueError, TypeError):
+                                fixed_row[idx] = None
+                                invalid += 1
+                fixed_rows.append(tuple(fixed_row))
+            if invalid:
+                logger.warning("[DHIS2] Could not convert %d measure values to float", invalid)
+
+        logger.info(
+            "[DHIS2] fetchall() returning %d rows with %d columns each",
+            len(fixed_rows),
+            len(column_names),
+        )
 
         return fixed_rows
 
     def fetchone(self):
         """Fetch one row"""
-        if self._rows:
-            return self._rows.pop(0)
+        if self._cursor_idx < len(self._rows):
+            row = self._rows[self._cursor_idx]
+            self._cursor_idx += 1
+            return row
         return None
 
     def fetchmany(self, size=None):
         """Fetch many rows"""
         if size is None:
             size = 1
-        result = self._rows[:size]
-        self._rows = self._rows[size:]
+        end = self._cursor_idx + size
+        result = self._rows[self._cursor_idx:end]
+        self._cursor_idx = min(end, len(self._rows))
         return result
 
     def close(self):
-        """Close cursor"""
-        pass
+        """Close cursor and drop the buffered result set"""
+        self._rows = []
+        self._cursor_idx = 0
+        self.rowcount = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     @property
     def description(self):